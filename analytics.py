@@ -0,0 +1,224 @@
+from collections import namedtuple
+
+import numpy as np
+
+from engine import FINAL_PNL_GUESS, FINAL_POSITION_GUESS, POSITION_CHECK
+from deck import NUM_RANKS
+from gamelog import CONFIG, DEAL, DECK, GUESS, INFER, INFERENCE_SCALE, RECORD_DTYPE, SETTLE, SUIT, decode_suit
+
+# Summary of a group of sessions' profits
+GroupStats = namedtuple('GroupStats', ['sessions', 'mean', 'std'])
+
+# Error of the inferred bot card values against the true cards
+InferenceAccuracy = namedtuple('InferenceAccuracy', ['quotes', 'bias', 'mean_absolute_error', 'rmse'])
+
+# How often the player's Hard mode guesses were correct
+GuessStats = namedtuple('GuessStats', ['guesses', 'hits', 'hit_rate'])
+
+# Per-session columns, one entry per settled session
+SessionTable = namedtuple('SessionTable', ['session', 'num_bots', 'game_mode', 'config', 'position', 'pnl',
+                                           'final_table_value', 'profit'])
+
+
+class SessionLogReader:
+    """
+    Vectorized analytics over binary game logs.
+
+    The log is memory-mapped and scanned in chunks; each query selects the few record kinds it
+    needs into NumPy columns and aggregates them with sorts, searches and bincounts, so no
+    Python object is ever created per record or per session.
+    """
+
+    def __init__(self, path, chunk_size=10_000_000):
+        """
+        Parameters:
+            path (str): Log file written by `gamelog.GameLog`.
+            chunk_size (int): Number of records scanned at once.
+        """
+        self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r')
+        self.chunk_size = chunk_size
+        self._sessions = None
+
+    def select(self, kind, fields):
+        """
+        Collect columns of every record of one kind.
+
+        Parameters:
+            kind (int): Record kind (e.g., `gamelog.SETTLE`).
+            fields (tuple): Record fields to return.
+
+        Returns:
+            dict: A NumPy array per field.
+        """
+        parts = {field: [] for field in fields}
+        for start in range(0, len(self.records), self.chunk_size):
+            chunk = self.records[start:start + self.chunk_size]
+            mask = chunk['kind'] == kind
+            for field in fields:
+                parts[field].append(np.asarray(chunk[field][mask]))
+        return {field: np.concatenate(columns) if columns else np.array([], dtype=RECORD_DTYPE[field])
+                for field, columns in parts.items()}
+
+    def sessions(self):
+        """
+        Build the per-session table of settled sessions (cached).
+
+        `config` identifies the suit and multiplier configuration of each session; use
+        `config_labels` to turn the ids into readable labels.
+
+        Returns:
+            SessionTable: One entry per session, sorted by session id. The profit is
+            position * final table value - PnL. Sessions settled more than once keep their last settlement.
+        """
+        if self._sessions is not None:
+            return self._sessions
+
+        settles = self.select(SETTLE, ('session', 'a', 'b', 'c'))
+        # Keep the last settlement of each session
+        reversed_sessions = settles['session'][::-1]
+        session, last = np.unique(reversed_sessions, return_index=True)
+        last = len(reversed_sessions) - 1 - last
+        position, pnl, final_table_value = settles['a'][last], settles['b'][last], settles['c'][last]
+
+        configs = self.select(CONFIG, ('session', 'a', 'c'))
+        index = _lookup(configs['session'], session)
+        num_bots, game_mode = configs['a'][index], configs['c'][index]
+
+        self._sessions = SessionTable(session, num_bots, game_mode, self._config_ids(session), position, pnl,
+                                      final_table_value, position * final_table_value - pnl)
+        return self._sessions
+
+    def _config_ids(self, session):
+        """
+        Hash each session's suit records (index, suit, multiplier, ranks) and deck record
+        (first rank, copies) into one 64-bit id.
+        """
+        suits = self.select(SUIT, ('session', 'bot', 'a', 'b', 'c'))
+        decks = self.select(DECK, ('session', 'bot', 'a', 'b', 'c'))
+        # Deck records hash under index -2 so they never collide with a suit's index
+        suits = {field: np.concatenate([suits[field], decks[field] - 2 if field == 'bot' else decks[field]])
+                 for field in suits}
+        with np.errstate(over='ignore'):
+            record_hash = (
+                (suits['bot'].astype(np.int64).astype(np.uint64) + np.uint64(1)) * np.uint64(0x9E3779B97F4A7C15)
+                ^ suits['a'].astype(np.uint64) * np.uint64(0xC2B2AE3D27D4EB4F)
+                ^ suits['b'].astype(np.uint64) * np.uint64(0x165667B19E3779F9)
+                ^ suits['c'].astype(np.uint64) * np.uint64(0x27D4EB2F165667C5)
+            )
+            ids = np.zeros(len(session), dtype=np.uint64)
+            index = np.searchsorted(session, suits['session'])
+            found = (index < len(session)) & (session[np.minimum(index, len(session) - 1)] == suits['session'])
+            np.add.at(ids, index[found], record_hash[found])
+        return ids
+
+    def config_labels(self):
+        """
+        Describe every suit and multiplier configuration in the log.
+
+        Returns:
+            dict: Config id -> label like 'c:+10 h:-10 s:+10', followed by the ranks and number
+            of copies for decks other than one copy of ranks 1-13 (e.g., 'c:+10 s:+10 ranks 0-19 x4').
+        """
+        table = self.sessions()
+        ids, first = np.unique(table.config, return_index=True)
+        suits = self.select(SUIT, ('session', 'bot', 'a', 'b'))
+        decks = self.select(DECK, ('session', 'a', 'b', 'c'))
+        labels = {}
+        # One Python step per distinct configuration, not per session
+        for config_id, session in zip(ids.tolist(), table.session[first].tolist()):
+            mask = suits['session'] == session
+            order = np.argsort(suits['bot'][mask])
+            label = ' '.join(f"{decode_suit(suit)}:{multiplier:+d}" for suit, multiplier in
+                             zip(suits['a'][mask][order].tolist(), suits['b'][mask][order].tolist()))
+            deck = np.nonzero(decks['session'] == session)[0]
+            if len(deck):
+                first_rank, num_decks, num_ranks = (int(decks[field][deck[0]]) for field in ('a', 'b', 'c'))
+                if (first_rank, num_decks, num_ranks) != (1, 1, NUM_RANKS):
+                    label += f" ranks {first_rank}-{first_rank + num_ranks - 1} x{num_decks}"
+            labels[config_id] = label
+        return labels
+
+    def pnl_by(self, column):
+        """
+        Group the sessions' profits by one column of the session table.
+
+        Parameters:
+            column (str): 'game_mode', 'num_bots' or 'config'.
+
+        Returns:
+            dict: Column value -> GroupStats (sessions, mean and standard deviation of the profit).
+        """
+        table = self.sessions()
+        return _group_stats(getattr(table, column), table.profit)
+
+    def pnl_by_game_mode(self):
+        """Profit statistics per difficulty mode (1 Easy, 2 Normal, 3 Hard)."""
+        return self.pnl_by('game_mode')
+
+    def pnl_by_bot_count(self):
+        """Profit statistics per number of bots."""
+        return self.pnl_by('num_bots')
+
+    def pnl_by_config(self):
+        """Profit statistics per suit and multiplier configuration, keyed by label."""
+        labels = self.config_labels()
+        return {labels[config_id]: stats for config_id, stats in self.pnl_by('config').items()}
+
+    def inference_accuracy(self):
+        """
+        Compare every inferred bot card value (the posterior mean in `Quote`) with the bot's true card.
+
+        Returns:
+            InferenceAccuracy: Number of quotes, mean error, mean absolute error and RMSE.
+        """
+        deals = self.select(DEAL, ('session', 'bot', 'b'))
+        inferences = self.select(INFER, ('session', 'bot', 'a'))
+
+        # Join on (session, bot) with a sorted key and a binary search
+        width = int(max(deals['bot'].max(initial=0), inferences['bot'].max(initial=0))) + 2
+        deal_keys = deals['session'] * np.uint64(width) + (deals['bot'] + 1).astype(np.uint64)
+        order = np.argsort(deal_keys)
+        deal_keys, true_values = deal_keys[order], deals['b'][order]
+        keys = inferences['session'] * np.uint64(width) + (inferences['bot'] + 1).astype(np.uint64)
+        index = np.minimum(np.searchsorted(deal_keys, keys), max(len(deal_keys) - 1, 0))
+        found = deal_keys[index] == keys if len(deal_keys) else np.zeros(len(keys), dtype=bool)
+
+        errors = inferences['a'][found] / INFERENCE_SCALE - true_values[index[found]]
+        if len(errors) == 0:
+            return InferenceAccuracy(0, 0.0, 0.0, 0.0)
+        return InferenceAccuracy(len(errors), float(errors.mean()), float(np.abs(errors).mean()),
+                                 float(np.sqrt((errors ** 2).mean())))
+
+    def guess_hit_rates(self):
+        """
+        Hit rates of the Hard mode guesses.
+
+        Returns:
+            dict: GuessStats for 'position_check' (the random checks from `random_trade_check`),
+            'final_position' and 'final_pnl'.
+        """
+        guesses = self.select(GUESS, ('bot', 'c'))
+        rates = {}
+        for name, question in (('position_check', POSITION_CHECK), ('final_position', FINAL_POSITION_GUESS),
+                               ('final_pnl', FINAL_PNL_GUESS)):
+            hits = guesses['c'][guesses['bot'] == question]
+            rates[name] = GuessStats(len(hits), int(hits.sum()), float(hits.mean()) if len(hits) else 0.0)
+        return rates
+
+
+def _lookup(haystack, keys):
+    """Return the index of each key in an unsorted array, assuming every key is present."""
+    order = np.argsort(haystack, kind='stable')
+    return order[np.searchsorted(haystack[order], keys)]
+
+
+def _group_stats(keys, values):
+    """Count, mean and standard deviation of values grouped by key, with one bincount per moment."""
+    groups, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(groups))
+    sums = np.bincount(inverse, weights=values, minlength=len(groups))
+    squares = np.bincount(inverse, weights=values.astype(np.float64) ** 2, minlength=len(groups))
+    means = sums / np.maximum(counts, 1)
+    stds = np.sqrt(np.maximum(squares / np.maximum(counts, 1) - means ** 2, 0))
+    return {group: GroupStats(int(count), float(mean), float(std))
+            for group, count, mean, std in zip(groups.tolist(), counts, means, stds)}
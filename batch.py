@@ -0,0 +1,246 @@
+"""
+Scripted, non-interactive batch mode.
+
+Reads a scenario file in JSON Lines format, one scenario per line, plays every session
+without prompts and streams one JSON line per session with its settlement:
+
+    {"id": "ev", "seed": 7, "config": {"num_bots": 3, "game_mode": 2}, "strategy": "ev-threshold"}
+    {"id": "recorded", "seed": 11, "trades": [[1, 0, -1, 0], [2, 0, 0, -2], [0, 4], [], [16]]}
+    {"id": "sweep", "seed": 0, "sessions": 1000, "strategy": {"name": "kelly", "fraction": 0.5},
+     "config": {"bot_model": "adaptive"}}
+
+Scenario fields (all optional):
+
+    id         Name echoed in the results (default: the line number).
+    seed       Seed of the session; with several sessions, session i is seeded with
+               `runner.session_seed(seed, i)` (default: 0).
+    sessions   Number of sessions to play (default: 1).
+    config     `Engine` arguments. `bot_model` is a name from `bots.BOT_MODELS`, or an object
+               with a "name" and the model's parameters.
+    strategy   A name from `strategies.STRATEGIES`, or an object with a "name" and the
+               strategy's parameters (default: always-skip).
+    trades     Pre-recorded trades instead of a strategy: trades[r][b] is the size traded
+               with bot b in round r (see `strategies.Scripted`).
+
+The file is read and the results are written one line at a time, and at most a few chunks
+of sessions are in flight at once, so memory stays constant however long the file is.
+
+    python batch.py scenarios.jsonl --output results.jsonl --workers 8
+"""
+import argparse
+import inspect
+import json
+import os
+import sys
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from bots import BOT_MODELS
+from engine import Engine
+from runner import play_game, session_seed
+from strategies import STRATEGIES, AlwaysSkip, Scripted
+
+# A parsed scenario; `strategy` is a Strategy instance and `config` holds ready `Engine` arguments
+Scenario = namedtuple('Scenario', ['id', 'seed', 'sessions', 'config', 'strategy'])
+
+# `Engine` arguments a scenario may set (the seed and log are set by the batch run, and no batch
+# session looks up a final table distribution, so an EV cache would never be used)
+CONFIG_KEYS = frozenset(inspect.signature(Engine).parameters) - {'seed', 'log', 'ev_cache'}
+
+
+def _named(spec, registry, kind):
+    """Resolve a name, or an object with a "name" and parameters, to (class, parameters)."""
+    if isinstance(spec, str):
+        spec = {'name': spec}
+    if not isinstance(spec, dict) or spec.get('name') not in registry:
+        raise ValueError(f"Unknown {kind} {spec!r}; choose from {sorted(registry)}.")
+    parameters = {key: value for key, value in spec.items() if key != 'name'}
+    return registry[spec['name']], parameters
+
+
+def parse_scenario(line, line_number):
+    """
+    Parse and validate one line of a scenario file.
+
+    Parameters:
+        line (str): A JSON object (see the module docstring).
+        line_number (int): Line number in the file, the default scenario id.
+
+    Returns:
+        Scenario: The parsed scenario.
+
+    Raises:
+        ValueError: If the line is not a valid scenario.
+    """
+    try:
+        spec = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON: {e}") from None
+    if not isinstance(spec, dict):
+        raise ValueError("A scenario must be a JSON object.")
+
+    config = dict(spec.get('config', {}))
+    unknown = set(config) - CONFIG_KEYS
+    if unknown:
+        raise ValueError(f"Unknown config keys: {sorted(unknown)}")
+    if 'bot_model' in config:
+        model, parameters = _named(config['bot_model'], BOT_MODELS, 'bot model')
+        config['bot_model'] = partial(model, **parameters) if parameters else model
+
+    if 'trades' in spec and 'strategy' in spec:
+        raise ValueError("Give either trades or a strategy, not both.")
+    if 'trades' in spec:
+        strategy = Scripted(spec['trades'])
+    elif 'strategy' in spec:
+        strategy_class, parameters = _named(spec['strategy'], STRATEGIES, 'strategy')
+        try:
+            strategy = strategy_class(**parameters)
+        except TypeError as e:
+            raise ValueError(f"Invalid strategy parameters: {e}") from None
+    else:
+        strategy = AlwaysSkip()
+
+    seed = spec.get('seed', 0)
+    if not isinstance(seed, int) or seed < 0:
+        raise ValueError("seed must be a non-negative integer.")
+    sessions = spec.get('sessions', 1)
+    if not isinstance(sessions, int) or sessions < 1:
+        raise ValueError("sessions must be a positive integer.")
+    return Scenario(spec.get('id', line_number), seed, sessions, config, strategy)
+
+
+def play_sessions(scenario, start, stop, log=None):
+    """
+    Play sessions start..stop-1 of a scenario.
+
+    Returns:
+        list: One result dict per session with the scenario id, session index, seed and either
+        the settlement (position, pnl, final_table_value, profit) or an error message.
+    """
+    results = []
+    for session in range(start, stop):
+        result = {'scenario': scenario.id, 'session': session, 'seed': scenario.seed}
+        try:
+            seed = scenario.seed if scenario.sessions == 1 else session_seed(scenario.seed, session)
+            result['seed'] = seed
+            settlement = play_game(scenario.strategy, seed, log=log, **scenario.config)
+        except (ValueError, TypeError) as e:
+            result['error'] = str(e)
+        else:
+            result.update(position=settlement.position, pnl=settlement.pnl,
+                          final_table_value=settlement.final_table_value, profit=settlement.profit)
+        results.append(result)
+    return results
+
+
+def play_tasks(tasks):
+    """Play a list of (scenario, start, stop) tasks, passing through the error results of invalid lines."""
+    results = []
+    for task in tasks:
+        if isinstance(task, dict):
+            results.append(task)
+        else:
+            results.extend(play_sessions(*task))
+    return results
+
+
+def _tasks(lines, chunk_size):
+    """
+    Group the scenarios into lists of (scenario, start, stop) tasks of about `chunk_size`
+    sessions in total; invalid lines become error results in place.
+    """
+    tasks, size = [], 0
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        try:
+            scenario = parse_scenario(line, line_number)
+        except ValueError as e:
+            tasks.append({'scenario': line_number, 'error': str(e)})
+            continue
+        for start in range(0, scenario.sessions, chunk_size):
+            stop = min(start + chunk_size, scenario.sessions)
+            tasks.append((scenario, start, stop))
+            size += stop - start
+            if size >= chunk_size:
+                yield tasks
+                tasks, size = [], 0
+    if tasks:
+        yield tasks
+
+
+def run_batch(lines, workers=1, chunk_size=100, log=None):
+    """
+    Play every scenario and yield the per-session results as they finish, in file order.
+
+    Parameters:
+        lines (iterable): Lines of a scenario file, read lazily.
+        workers (int): Number of worker processes. 1 plays in this process.
+        chunk_size (int): Sessions per chunk sent to a worker.
+        log (GameLog): Binary log to record every session to (only with one worker).
+
+    Yields:
+        dict: One result per session (see `play_sessions`), or per invalid scenario line.
+    """
+    if workers == 1:
+        for tasks in _tasks(lines, chunk_size):
+            for task in tasks:
+                yield from [task] if isinstance(task, dict) else play_sessions(*task, log=log)
+        return
+    if log is not None:
+        raise ValueError("Sessions can only be logged with a single worker.")
+
+    # Keep a bounded window of chunks in flight and yield their results in submission order
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for tasks in _tasks(lines, chunk_size):
+            pending.append(executor.submit(play_tasks, tasks))
+            if len(pending) >= workers * 4:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play every session of a scenario file without prompts.")
+    parser.add_argument('scenarios', help="scenario file, one JSON object per line ('-' for stdin)")
+    parser.add_argument('--output', help="write the JSON Lines results to this file instead of stdout")
+    parser.add_argument('--workers', type=int, default=1, help="worker processes (0 for all cores, default: 1)")
+    parser.add_argument('--chunk-size', type=int, default=100, help="sessions per chunk sent to a worker (default: 100)")
+    parser.add_argument('--log', help="append a binary record of every session to this file (one worker only)")
+    args = parser.parse_args(argv)
+
+    workers = args.workers or os.cpu_count() or 1
+    if args.log and workers != 1:
+        parser.error("--log needs a single worker")
+
+    scenarios = sys.stdin if args.scenarios == '-' else open(args.scenarios)
+    output = open(args.output, 'w') if args.output else sys.stdout
+    log = None
+    if args.log:
+        from gamelog import GameLog
+
+        log = GameLog(args.log)
+
+    sessions = errors = 0
+    try:
+        for result in run_batch(scenarios, workers, args.chunk_size, log):
+            output.write(json.dumps(result) + '\n')
+            output.flush()
+            sessions += 1
+            errors += 'error' in result
+    finally:
+        if log is not None:
+            log.close()
+        if scenarios is not sys.stdin:
+            scenarios.close()
+        if output is not sys.stdout:
+            output.close()
+
+    print(f"{sessions} results, {errors} errors", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
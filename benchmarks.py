@@ -0,0 +1,181 @@
+"""
+Benchmark suite for the quoting, inference and settlement paths.
+
+Runs with plain Python and prints machine-readable JSON, so results can be saved per commit
+and compared later:
+
+    python benchmarks.py --output before.json
+    python benchmarks.py --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import string
+import subprocess
+import sys
+import time
+import timeit
+
+from engine import Engine
+from runner import play_game
+from strategies import EVThreshold
+
+BOT_COUNTS = (1, 10, 100, 500)
+SUIT_COUNTS = (3, 4, 20, 52)  # 39, 52, 260 and 676 cards with 13 ranks per suit
+FLOP_COUNTS = (1, 4, 8)
+DECK_COUNTS = (1, 100)  # Copies of the deck; 100 copies of 52 suits is 67,600 cards
+
+QUICK_BOT_COUNTS = (1, 10)
+QUICK_SUIT_COUNTS = (3, 4)
+QUICK_FLOP_COUNTS = (4,)
+QUICK_DECK_COUNTS = (1,)
+
+
+def make_config(num_bots, num_suits, num_flops, num_decks=1):
+    """Build `Engine` arguments for `num_decks` copies of `num_suits` suits alternating between +10 and -10."""
+    suits = list(string.ascii_letters[:num_suits])
+    multipliers = {suit: 10 if i % 2 == 0 else -10 for i, suit in enumerate(suits)}
+    return {'num_bots': num_bots, 'suits': suits, 'multipliers': multipliers, 'num_flops': num_flops,
+            'num_decks': num_decks}
+
+
+def time_per_call(function, repeat=3, min_time=0.02):
+    """
+    Time a function with `timeit`, calling it enough times per measurement to take `min_time`.
+
+    Returns:
+        tuple: (calls per measurement, best seconds per call over `repeat` measurements)
+    """
+    timer = timeit.Timer(function)
+    calls = 1
+    while calls < 1_000_000:
+        elapsed = timer.timeit(calls)
+        if elapsed >= min_time:
+            break
+        # Scale up towards min_time, at most tenfold at a time
+        calls = min(calls * 10, max(calls + 1, int(calls * min_time / max(elapsed, 1e-9) * 1.2)))
+    return calls, min(timer.repeat(repeat, calls)) / calls
+
+
+def benchmark_config(config, repeat):
+    """Run every benchmark for one configuration."""
+    game = Engine(seed=0, **config)
+    # Play half the community cards so the quoting state is realistic
+    for _ in range(game.num_flops // 2):
+        game.flop()
+    for bot_index in range(game.num_bots):
+        game.quote(bot_index)
+    bid, ask, _ = game.bot_market(0)
+
+    benchmarks = {
+        'quote_round': game.quote_round,
+        'infer_bot_card_value': lambda: game.infer_bot_card_value(bid, ask),
+        'calculate_expected_final_table_with_inferred_bots': game.calculate_expected_final_table_with_inferred_bots,
+        'settle': game.settle,
+        'session': lambda: play_game(EVThreshold(), seed=0, **config),
+    }
+
+    results = []
+    for name, function in benchmarks.items():
+        calls, seconds = time_per_call(function, repeat)
+        results.append({
+            'benchmark': name,
+            'num_bots': config['num_bots'],
+            'deck_size': len(game.card_table),
+            'num_flops': config['num_flops'],
+            'calls': calls,
+            'seconds_per_call': seconds,
+        })
+    return results
+
+
+def run(quick=False, repeat=3):
+    """
+    Run the benchmark grid.
+
+    Parameters:
+        quick (bool): Use a small grid for a fast sanity check.
+        repeat (int): Number of measurements per benchmark (the best one is kept).
+
+    Returns:
+        dict: Environment metadata and one result per (benchmark, bots, deck size, flops).
+    """
+    bot_counts, suit_counts, flop_counts, deck_counts = (
+        (QUICK_BOT_COUNTS, QUICK_SUIT_COUNTS, QUICK_FLOP_COUNTS, QUICK_DECK_COUNTS) if quick
+        else (BOT_COUNTS, SUIT_COUNTS, FLOP_COUNTS, DECK_COUNTS)
+    )
+    results = []
+    for num_bots in bot_counts:
+        for num_suits in suit_counts:
+            for num_flops in flop_counts:
+                for num_decks in deck_counts:
+                    # Skip decks too small to deal every player and community card
+                    if num_bots + 1 + num_flops > 13 * num_suits * num_decks:
+                        continue
+                    results.extend(benchmark_config(make_config(num_bots, num_suits, num_flops, num_decks), repeat))
+    return {'meta': metadata(), 'results': results}
+
+
+def metadata():
+    """Describe the environment the benchmarks ran in."""
+    try:
+        # Ask the repository this file lives in, wherever the benchmarks are run from
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def compare(baseline, current):
+    """
+    Compare two benchmark runs.
+
+    Returns:
+        list: (benchmark, bots, deck size, flops, baseline seconds, current seconds, ratio) for
+        every result present in both runs. A ratio above 1 is a slowdown.
+    """
+    def key(result):
+        return result['benchmark'], result['num_bots'], result['deck_size'], result['num_flops']
+
+    baseline_times = {key(result): result['seconds_per_call'] for result in baseline['results']}
+    rows = []
+    for result in current['results']:
+        before = baseline_times.get(key(result))
+        if before:
+            rows.append((*key(result), before, result['seconds_per_call'], result['seconds_per_call'] / before))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the quoting, inference and settlement paths.")
+    parser.add_argument('--quick', action='store_true', help="run a small grid")
+    parser.add_argument('--repeat', type=int, default=3, help="measurements per benchmark (default: 3)")
+    parser.add_argument('--output', help="write the JSON results to this file instead of stdout")
+    parser.add_argument('--compare', help="baseline JSON file to compare against")
+    args = parser.parse_args(argv)
+
+    results = run(quick=args.quick, repeat=args.repeat)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"{'Benchmark':<52}{'Bots':>6}{'Deck':>6}{'Flops':>6}{'Ratio':>8}", file=sys.stderr)
+        for name, num_bots, deck_size, num_flops, _, _, ratio in compare(baseline, results):
+            print(f"{name:<52}{num_bots:>6}{deck_size:>6}{num_flops:>6}{ratio:>8.2f}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+"""
+Bot market making models.
+
+A model decides how every bot in a game quotes. The engine creates one model per game with
+`bot_model(game)`, asks it for all bots' markets once per round (`quotes`) and tells it about
+each of the player's fills (`record_fill`). Quotes are computed for all bots at once with NumPy
+through `quote_markets`, so a round costs the same handful of array operations at any number
+of bots.
+
+A model that shifts its markets away from its fair value by an amount the player can work out
+(e.g., from their own trades) reports that shift in `skews`, so the engine can take it out
+before inferring the bots' cards from their quotes. Random shifts the player cannot see are
+described by `midpoint_noise` instead, which the engine's posterior uses as its likelihood.
+"""
+import numpy as np
+
+
+def quote_markets(mid_points, half_spreads, skews=0):
+    """
+    Turn fair values into integer bid and ask quotes for every bot at once.
+
+    Parameters:
+        mid_points (np.ndarray): Each bot's fair value of the final table.
+        half_spreads (np.ndarray): Distance from the (skewed) midpoint to each side of the market.
+        skews (np.ndarray): Shift of each bot's midpoint (e.g., away from its inventory).
+
+    Returns:
+        tuple: (bids, asks) as int64 arrays, truncated towards zero like `int()`.
+    """
+    centers = mid_points + skews
+    bids = np.trunc(centers - half_spreads).astype(np.int64)
+    asks = np.trunc(centers + half_spreads).astype(np.int64)
+    return bids, asks
+
+
+class BotModel:
+    """
+    Base class for bot market making models.
+
+    Subclasses implement `quotes`; `record_fill` is optional and lets a model learn from the
+    player's trades.
+    """
+
+    # Probability of each random shift of a bot's midpoint from its (skewed) fair value
+    midpoint_noise = {0: 1.0}
+
+    def __init__(self, game):
+        """
+        Parameters:
+            game (Engine): The game whose bots this model quotes for.
+        """
+        self.game = game
+        # Draw the bots' own randomness from the game's generator so seeded games stay reproducible
+        self.rng = np.random.default_rng(game.rng.getrandbits(64))
+        # Shift of each bot's current midpoint from its fair value, as seen by the player
+        self.skews = np.zeros(game.num_bots)
+        bot_cards = [game.bot_card(bot_index) for bot_index in range(game.num_bots)]
+        self.card_values = game.card_table.value_array[bot_cards].astype(np.float64)
+
+    def fair_values(self):
+        """
+        Each bot's expected value of the final table: its own card, the revealed community
+        cards and the expected value of every card it cannot see.
+
+        Returns:
+            np.ndarray: One fair value per bot.
+        """
+        game = self.game
+        num_unknown_cards = game.num_flops - len(game.flops) + (game.num_players - 1)
+        expected_value_unknown_cards = game.deck_state.expected_value_per_card() * num_unknown_cards
+        return self.card_values + game.deck_state.community_value + expected_value_unknown_cards
+
+    def volume(self):
+        """Trade volume for the current round (doubles as more community cards are revealed)."""
+        return 2 ** len(self.game.flops)
+
+    def quotes(self):
+        """
+        Draw every bot's market for the current round.
+
+        Returns:
+            tuple: (bids, asks, volumes) as int64 arrays, one entry per bot.
+        """
+        raise NotImplementedError
+
+    def record_fill(self, fill):
+        """Learn from one of the player's trades (`Fill`) against a bot. Does nothing by default."""
+
+
+class ClassicBots(BotModel):
+    """
+    The original bots: quote around their own expected value with a random spread of 10-20,
+    lean the whole market by a random asymmetry of -5 to 5, and never react to trades.
+
+    The asymmetry moves the bid and the ask the same way, so it shifts the midpoint and a
+    quote only narrows down the bot's card to within a few points.
+    """
+
+    midpoint_noise = {asymmetry: 1 / 11 for asymmetry in range(-5, 6)}
+
+    def quotes(self):
+        num_bots = self.game.num_bots
+        half_spreads = self.rng.integers(10, 20, size=num_bots, endpoint=True)
+        asymmetries = self.rng.integers(-5, 5, size=num_bots, endpoint=True)
+        bids, asks = quote_markets(self.fair_values() + asymmetries, half_spreads)
+        return bids, asks, np.full(self.game.num_bots, self.volume(), dtype=np.int64)
+
+
+class AdaptiveBots(BotModel):
+    """
+    Inventory-aware bots that widen with uncertainty and learn from the player's flow.
+
+    - Spread: a random base spread plus `variance_weight` times the standard deviation of the
+      cards the bots cannot see yet, so markets tighten as the table is revealed.
+    - Inventory skew: each bot shifts its market by `inventory_skew` per lot against its own
+      inventory, to get flat again.
+    - Adverse selection: the bots share an exponentially weighted estimate of which way the
+      player trades (+1 always buying, -1 always selling) and shift their markets by
+      `adverse_selection` standard deviations in that direction.
+    """
+
+    def __init__(self, game, base_spread=(10, 20), variance_weight=0.1, inventory_skew=2.0, adverse_selection=0.25,
+                 learning_rate=0.5):
+        """
+        Parameters:
+            game (Engine): The game whose bots this model quotes for.
+            base_spread (tuple): Range (inclusive) of the random base half-spread.
+            variance_weight (float): Extra half-spread per standard deviation of the unknown cards.
+            inventory_skew (float): Midpoint shift per lot of inventory.
+            adverse_selection (float): Midpoint shift, in standard deviations, for a player who always trades one way.
+            learning_rate (float): Weight of each new trade in the estimate of the player's direction.
+        """
+        super().__init__(game)
+        self.base_spread = base_spread
+        self.variance_weight = variance_weight
+        self.inventory_skew = inventory_skew
+        self.adverse_selection = adverse_selection
+        self.learning_rate = learning_rate
+
+        self.inventory = np.zeros(game.num_bots, dtype=np.int64)  # Bots' net positions from the player's trades
+        self.flow = 0.0  # Estimated direction of the player's trades, between -1 and 1
+
+    def unknown_standard_deviation(self):
+        """
+        Standard deviation of the total of the cards a bot cannot see: the remaining community
+        cards and the other players' cards, drawn without replacement from the remaining deck
+        and the other players' hands.
+        """
+        game = self.game
+        num_unknown_cards = game.num_flops - len(game.flops) + (game.num_players - 1)
+        pool = game.deck_state.remaining_count + (game.num_players - 1)
+        if pool <= 1:
+            return 0.0
+        variance = num_unknown_cards * game.deck_state.variance_per_card() * (pool - num_unknown_cards) / (pool - 1)
+        return variance ** 0.5
+
+    def quotes(self):
+        game = self.game
+        standard_deviation = self.unknown_standard_deviation()
+
+        low, high = self.base_spread
+        half_spreads = self.rng.integers(low, high, size=game.num_bots, endpoint=True) \
+            + self.variance_weight * standard_deviation
+        # The player knows every input of the skew from their own trades and the revealed cards
+        self.skews = self.adverse_selection * self.flow * standard_deviation - self.inventory_skew * self.inventory
+        bids, asks = quote_markets(self.fair_values(), half_spreads, self.skews)
+        return bids, asks, np.full(game.num_bots, self.volume(), dtype=np.int64)
+
+    def record_fill(self, fill):
+        if fill.size == 0:
+            return
+        # The bot takes the other side of the player's trade
+        self.inventory[fill.bot_index] -= fill.size
+        direction = 1.0 if fill.size > 0 else -1.0
+        self.flow += self.learning_rate * (direction - self.flow)
+
+
+# Built-in bot models by name
+BOT_MODELS = {'classic': ClassicBots, 'adaptive': AdaptiveBots}
@@ -0,0 +1,187 @@
+import re
+from functools import lru_cache
+
+import numpy as np
+
+NUM_RANKS = 13  # Ranks 1 to 13 in every suit
+
+CARD_NAME = re.compile(r'(.+?)(-?\d+)')  # A suit name followed by a (possibly negative) rank
+
+
+class CardTable:
+    """
+    Integer card encoding with a value table built once from the suit multipliers.
+
+    A deck is `num_decks` copies of every suit, each with ranks `first_rank` to
+    `first_rank + num_ranks - 1`, and a card's value is its suit multiplier times its rank.
+    A card is the int ``copy * suits * num_ranks + suit_index * num_ranks + (rank - first_rank)``,
+    so valuing a card is a single list lookup and valuing many cards is one vectorized gather.
+    Cards are only rendered as strings like "s8" at the print boundary; copies of the same
+    card share a name.
+    """
+
+    def __init__(self, suits, multiplier_dict, num_ranks=NUM_RANKS, first_rank=1, num_decks=1):
+        """
+        Parameters:
+            suits (list): Suit names in the game (e.g., ['c', 'h', 's']). Names may be longer
+                than one character but must not end in a digit.
+            multiplier_dict (dict): Multiplier for each suit.
+            num_ranks (int): Number of ranks per suit.
+            first_rank (int): Lowest rank of every suit.
+            num_decks (int): Number of copies of the deck shuffled together.
+        """
+        self.suits = list(suits)
+        if any(not suit or suit[-1].isdigit() for suit in self.suits):
+            raise ValueError("Suit names must be non-empty and must not end in a digit.")
+        if num_ranks < 1 or num_decks < 1:
+            raise ValueError("A deck needs at least one rank and one copy.")
+        self.suit_index = {suit: i for i, suit in enumerate(self.suits)}
+        self.num_ranks = num_ranks
+        self.first_rank = first_rank
+        self.num_decks = num_decks
+
+        # Value of every card in one copy of the deck, then tiled for the copies
+        multipliers = np.array([multiplier_dict[suit] for suit in self.suits], dtype=np.int64)
+        ranks = np.arange(first_rank, first_rank + num_ranks, dtype=np.int64)
+        copy_values = np.outer(multipliers, ranks).ravel()
+        self.value_array = np.tile(copy_values, num_decks)
+        self.values = self.value_array.tolist()
+        self.total = int(copy_values.sum()) * num_decks  # Total value of the full deck
+        self.square_total = int((copy_values ** 2).sum()) * num_decks  # Sum of squared values of the full deck
+
+        # Cards sharing a value are interchangeable for valuation: index every card's value
+        # among the distinct values, with the number of cards holding each value
+        self.distinct_values, copy_index, copy_counts = np.unique(copy_values, return_inverse=True,
+                                                                  return_counts=True)
+        self.value_index = np.tile(copy_index, num_decks)
+        self.value_counts = copy_counts * num_decks
+
+        # Tables are shared between games (see `card_table`), so they must never be modified
+        for array in (self.value_array, self.distinct_values, self.value_index, self.value_counts):
+            array.flags.writeable = False
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, name):
+        """Convert a card name (e.g., "s8") to its integer code (the first copy's, with several decks)."""
+        match = CARD_NAME.fullmatch(name)
+        if match is None or match.group(1) not in self.suit_index:
+            raise ValueError(f"Unknown card: {name!r}")
+        rank = int(match.group(2)) - self.first_rank
+        if not 0 <= rank < self.num_ranks:
+            raise ValueError(f"Unknown card: {name!r}")
+        return self.suit_index[match.group(1)] * self.num_ranks + rank
+
+    def name(self, card):
+        """Render an integer card as its display name (e.g., "s8")."""
+        suit_index, rank = divmod(card % (len(self.suits) * self.num_ranks), self.num_ranks)
+        return f'{self.suits[suit_index]}{rank + self.first_rank}'
+
+    def names(self, cards):
+        """Render a list of integer cards as display names."""
+        return [self.name(card) for card in cards]
+
+    def value(self, card):
+        """Return the value of a single integer card."""
+        return self.values[card]
+
+    def total_value(self, cards):
+        """Return the summed value of many integer cards with one vectorized gather."""
+        if len(cards) == 0:
+            return 0
+        return int(self.value_array[np.asarray(cards, dtype=np.intp)].sum())
+
+    def total_square_value(self, cards):
+        """Return the summed squared value of many integer cards with one vectorized gather."""
+        if len(cards) == 0:
+            return 0
+        return int((self.value_array[np.asarray(cards, dtype=np.intp)] ** 2).sum())
+
+
+def card_table(suits, multiplier_dict, num_ranks=NUM_RANKS, first_rank=1, num_decks=1):
+    """
+    Return the `CardTable` for a deck configuration, building it only the first time the
+    configuration is seen, so games with the same deck share one table.
+    """
+    multipliers = tuple((suit, multiplier_dict[suit]) for suit in suits)
+    return _cached_card_table(multipliers, num_ranks, first_rank, num_decks)
+
+
+@lru_cache(maxsize=64)
+def _cached_card_table(multipliers, num_ranks, first_rank, num_decks):
+    return CardTable([suit for suit, _ in multipliers], dict(multipliers), num_ranks, first_rank, num_decks)
+
+
+class DeckState:
+    """
+    Keep running totals over the deck so expected-value queries never rescan it.
+
+    The deck starts as every card of the card table. `order` is the pre-shuffled array of cards
+    to deal, dealt from the front by advancing an index, so dealing never moves or copies cards.
+    It only needs to hold the cards that will actually be dealt: the rest of the deck is never
+    looked at, since the remaining value sum (and sum of squares), remaining card count and
+    revealed community sum start from the card table's totals and are updated in O(1) whenever
+    a card is dealt to a player or flopped to the table.
+    """
+
+    def __init__(self, order, card_table):
+        """
+        Parameters:
+            order (np.ndarray): The first cards of the shuffled deck, in dealing order.
+            card_table (CardTable): Value table for the cards in the deck.
+        """
+        self.order = order
+        self.top = 0  # Index of the next card to deal
+        self.values = card_table.values
+        self.flops = []  # Revealed community cards
+
+        self.remaining_value = card_table.total  # Total value of cards still in the deck
+        self.remaining_square_sum = card_table.square_total  # Sum of squared values left in the deck
+        self.remaining_count = len(card_table)  # Number of cards still in the deck
+        self.community_value = 0  # Total value of revealed community cards
+
+    def deal(self):
+        """Deal the top card of the deck and return it."""
+        if self.top == len(self.order):
+            raise IndexError("deal past the shuffled cards")
+        card = int(self.order[self.top])
+        self.top += 1
+        value = self.values[card]
+        self.remaining_value -= value
+        self.remaining_square_sum -= value * value
+        self.remaining_count -= 1
+        return card
+
+    def flop(self):
+        """Reveal the top card of the deck as a community card and return it."""
+        card = self.deal()
+        self.flops.append(card)
+        self.community_value += self.values[card]
+        return card
+
+    def expected_value_per_card(self):
+        """Return the mean value of the cards still in the deck (0 when the deck is empty)."""
+        return self.remaining_value / self.remaining_count if self.remaining_count > 0 else 0
+
+    def variance_per_card(self):
+        """Return the population variance of the values still in the deck (0 when the deck is empty)."""
+        if self.remaining_count == 0:
+            return 0
+        mean = self.remaining_value / self.remaining_count
+        return max(self.remaining_square_sum / self.remaining_count - mean * mean, 0)
+
+    def variance_of_draws(self, num_cards):
+        """
+        Return the variance of the total value of `num_cards` cards drawn without replacement.
+
+        Parameters:
+            num_cards (int): Number of unknown cards that will come from the remaining deck.
+
+        Returns:
+            float: n * variance * (N - n) / (N - 1), the finite population variance of the sum.
+        """
+        if self.remaining_count <= 1:
+            return 0
+        return (num_cards * self.variance_per_card()
+                * (self.remaining_count - num_cards) / (self.remaining_count - 1))
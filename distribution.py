@@ -0,0 +1,167 @@
+from collections import Counter, namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+
+class FinalTableDistribution(namedtuple('FinalTableDistribution', ['mean', 'variance', 'values', 'probabilities'])):
+    """
+    Exact mean and variance of the final table value, with the full distribution when requested.
+
+    `values` and `probabilities` are sorted NumPy arrays over every reachable final table value,
+    or None when only the moments were computed.
+    """
+    __slots__ = ()
+
+    def quantile(self, q):
+        """Return the smallest final table value whose cumulative probability is at least q."""
+        if self.values is None:
+            raise ValueError("The full distribution was not computed.")
+        index = np.searchsorted(np.cumsum(self.probabilities), q - 1e-12)
+        return self.values[min(index, len(self.values) - 1)]
+
+
+def final_table_moments(card_table, known_cards, num_unknown_cards):
+    """
+    Exact mean and variance of the final table given the known cards.
+
+    The unknown cards are drawn without replacement from every card that is not known, so the
+    sum of n of them has mean n * mu and variance n * sigma^2 * (N - n) / (N - 1).
+
+    Parameters:
+        card_table (CardTable): Value table of the full deck.
+        known_cards (list): Cards whose values are known (e.g., the player's card and the flops).
+        num_unknown_cards (int): Number of cards still to be counted in the final table.
+
+    Returns:
+        tuple: (mean, variance)
+    """
+    known_values = [card_table.values[card] for card in known_cards]
+    return _moments(card_table, known_values, num_unknown_cards)
+
+
+def final_table_distribution(card_table, known_cards, num_unknown_cards, cache=None):
+    """
+    Exact distribution of the final table given the known cards.
+
+    Computes the probability of each possible sum with a DP over the distinct remaining card
+    values, adding the hypergeometric probability of drawing j of the m cards sharing a value.
+    Results are cached in memory by the multiset of known values and the number of unknown
+    cards, and on disk when `cache` is given.
+
+    Parameters:
+        card_table (CardTable): Value table of the full deck.
+        known_cards (list): Cards whose values are known (e.g., the player's card and the flops).
+        num_unknown_cards (int): Number of cards still to be counted in the final table.
+        cache (evcache.EVCache): Disk cache shared between processes (optional).
+
+    Returns:
+        FinalTableDistribution: The mean, variance, values and probabilities.
+    """
+    known_values = tuple(sorted(card_table.values[card] for card in known_cards))
+    mean, variance = _moments(card_table, known_values, num_unknown_cards)
+    sums, probabilities = _unknown_sum_distribution(card_table, known_values, num_unknown_cards, cache)
+    return FinalTableDistribution(mean, variance, sum(known_values) + sums, probabilities)
+
+
+def _moments(card_table, known_values, num_unknown_cards):
+    """Exact mean and variance of the known values plus n cards drawn from the rest of the deck."""
+    num_remaining = len(card_table) - len(known_values)
+    if num_unknown_cards > num_remaining:
+        raise ValueError("More unknown cards than cards left in the deck.")
+
+    known_value = sum(known_values)
+    if num_remaining == 0:
+        return known_value, 0
+
+    remaining_value = card_table.total - known_value
+    remaining_square_value = card_table.square_total - sum(v * v for v in known_values)
+    mean_per_card = remaining_value / num_remaining
+    variance_per_card = max(remaining_square_value / num_remaining - mean_per_card * mean_per_card, 0)
+
+    mean = known_value + num_unknown_cards * mean_per_card
+    if num_remaining == 1:
+        return mean, 0
+    variance = (num_unknown_cards * variance_per_card
+                * (num_remaining - num_unknown_cards) / (num_remaining - 1))
+    return mean, variance
+
+
+@lru_cache(maxsize=4096)
+def _unknown_sum_distribution(card_table, known_values, num_unknown_cards, cache=None):
+    """
+    Distribution of the sum of n cards drawn without replacement from the deck minus the known
+    values, read from the disk cache when it has it.
+
+    Returns:
+        tuple: (sums, probabilities) as read-only NumPy arrays over the reachable sums.
+    """
+    if cache is not None:
+        cached = cache.get(card_table, known_values, num_unknown_cards)
+        if cached is not None:
+            return tuple(_read_only(array) for array in cached)
+    sums, probabilities = unknown_sum_distribution(card_table, known_values, num_unknown_cards)
+    if cache is not None:
+        cache.put(card_table, known_values, num_unknown_cards, sums, probabilities)
+    return _read_only(sums), _read_only(probabilities)
+
+
+def unknown_sum_distribution(card_table, known_values, num_unknown_cards):
+    """
+    Compute the distribution of the sum of n cards drawn without replacement from the deck
+    minus the known values (uncached).
+
+    Returns:
+        tuple: (sums, probabilities) as NumPy arrays over the reachable sums.
+    """
+    counts = Counter(dict(zip(card_table.distinct_values.tolist(), card_table.value_counts.tolist())))
+    counts.subtract(known_values)
+    counts = {value: count for value, count in counts.items() if count > 0}
+    num_remaining = sum(counts.values())
+    n = num_unknown_cards
+    if n > num_remaining:
+        raise ValueError("More unknown cards than cards left in the deck.")
+    if n == 0:
+        return np.zeros(1, dtype=np.int64), np.ones(1)
+
+    # probabilities[k, s] = probability that k cards drawn from the values processed so far sum to s
+    # (shifted by the minimum value). Adding the m cards of a value to a pool of N cards, k cards
+    # include j of them with the hypergeometric probability C(N, k - j) C(m, j) / C(N + m, k), so
+    # every entry stays in [0, 1] however large the deck or the binomial coefficients get.
+    low = min(counts)
+    width = n * (max(counts) - low) + 1
+    probabilities = np.zeros((n + 1, width))
+    probabilities[0, 0] = 1
+    pool, log_pool = 0, _log_comb(0, n)
+    log_counts = {}  # Values usually share a few counts
+    for value, count in counts.items():
+        shift = value - low
+        if count not in log_counts:
+            log_counts[count] = _log_comb(count, n)
+        log_count, log_new_pool = log_counts[count], _log_comb(pool + count, n)
+        top = min(n, pool + count)  # At most this many cards can be drawn from the new pool
+        updated = np.zeros_like(probabilities)
+        for j in range(min(count, n) + 1):
+            offset = j * shift
+            weights = np.exp(log_pool[:top + 1 - j] + log_count[j] - log_new_pool[j:top + 1])
+            updated[j:top + 1, offset:] += weights[:, None] * probabilities[:top + 1 - j, :width - offset]
+        probabilities = updated
+        pool, log_pool = pool + count, log_new_pool
+
+    reachable = np.nonzero(probabilities[n])[0]
+    sums = reachable + n * low
+    return sums.astype(np.int64), probabilities[n, reachable]
+
+
+def _log_comb(total, n):
+    """Return log C(total, k) for k = 0..n, with -inf where k > total."""
+    k = np.arange(n)
+    with np.errstate(divide='ignore'):
+        terms = np.log(np.maximum(total - k, 0)) - np.log(k + 1)
+    return np.concatenate(([0.0], np.cumsum(terms)))
+
+
+def _read_only(array):
+    """Mark a cached array as read-only so callers cannot corrupt the cache."""
+    array.flags.writeable = False
+    return array
@@ -0,0 +1,465 @@
+import numbers
+import random
+from collections import namedtuple
+
+import numpy as np
+
+from bots import ClassicBots
+from deck import NUM_RANKS, DeckState, card_table
+from distribution import FinalTableDistribution, final_table_distribution, final_table_moments
+from inference import BotCardPosterior
+from ledger import TradeLedger
+
+DEFAULT_MULTIPLIERS = {'d': -10, 'c': 10, 'h': -10, 's': 10}
+DEFAULT_SUITS = ['c', 'h', 's']  # Default suits (exclude diamonds)
+
+EASY, NORMAL, HARD = 1, 2, 3  # Game difficulty modes
+POSITION_CHECK, FINAL_POSITION_GUESS, FINAL_PNL_GUESS = range(3)  # Questions asked in Hard mode
+
+# Structured results returned by the step-wise engine API
+Quote = namedtuple('Quote', ['bot_index', 'bid', 'ask', 'volume', 'inferred_value', 'expected_value'])
+Fill = namedtuple('Fill', ['bot_index', 'size', 'price'])
+
+
+class Settlement(namedtuple('Settlement', ['position', 'pnl', 'final_table_value'])):
+    __slots__ = ()
+
+    @property
+    def profit(self):
+        """Value of the final position at the final table minus the PnL (cash paid) from trades."""
+        return self.position * self.final_table_value - self.pnl
+
+
+def describe_position(position):
+    """Describe a net position the way the player is asked to guess it (e.g., 'long 3', 'short 2', 'neutral')."""
+    if position > 0:
+        return f"long {position}"
+    if position < 0:
+        return f"short {abs(position)}"
+    return "neutral"
+
+
+def parse_position(guess):
+    """
+    Parse a position guess like 'long 3', 'short 2' or 'neutral'.
+
+    Returns:
+        int: The guessed net position, or None if the guess is not in that format.
+    """
+    words = guess.strip().lower().split()
+    if words == ['neutral']:
+        return 0
+    if len(words) == 2 and words[0] in ('long', 'short') and words[1].isdigit() and int(words[1]) > 0:
+        return int(words[1]) if words[0] == 'long' else -int(words[1])
+    return None
+
+
+class Engine:
+    """
+    Headless market making game engine.
+
+    All configuration is passed in as arguments and nothing here prints or prompts, so the
+    engine can be imported and driven programmatically through `quote`, `trade`, `flop`
+    and `settle`. The interactive game in `main.py` is a thin frontend on top of it.
+    """
+
+    def __init__(self, num_bots=4, suits=None, multipliers=None, num_flops=4, game_mode=NORMAL, seed=None,
+                 log=None, bot_model=None, num_ranks=NUM_RANKS, first_rank=1, num_decks=1, ev_cache=None):
+        """
+        Parameters:
+            num_bots (int): Number of bots in the game (at least 1).
+            suits (list): Suit names to include (default: C, H and S).
+            multipliers (dict): Multiplier for each suit (default: +10 for C/S, -10 for D/H).
+            num_flops (int): Number of community cards to reveal.
+            game_mode (int): Difficulty level (1 for Easy, 2 for Normal, 3 for Hard).
+            seed: Seed for the game's random number generator.
+            log (GameLog): Binary log to record the session to (optional).
+            bot_model: Bot market making model class, called as `bot_model(game)` (default: `bots.ClassicBots`).
+            num_ranks (int): Number of ranks in every suit.
+            first_rank (int): Lowest rank of every suit (cards are worth multiplier * rank).
+            num_decks (int): Number of copies of the deck shuffled together.
+            ev_cache (evcache.EVCache): Disk cache of precomputed final table distributions (optional).
+        """
+        if num_bots < 1:
+            raise ValueError("You must have at least 1 bot.")
+        if num_flops < 0:
+            raise ValueError("The number of community cards cannot be negative.")
+        if game_mode not in (EASY, NORMAL, HARD):
+            raise ValueError("The game mode must be 1 (Easy), 2 (Normal) or 3 (Hard).")
+
+        multipliers = DEFAULT_MULTIPLIERS if multipliers is None else multipliers
+        self.available_suits = list(suits) if suits else list(DEFAULT_SUITS)
+        missing = [suit for suit in self.available_suits if suit not in multipliers]
+        if missing:
+            raise ValueError(f"No multiplier given for suits: {missing}")
+        self.multiplier_dict = {suit: multipliers[suit] for suit in self.available_suits}
+
+        self.seed = seed
+        # Every random draw in the game goes through this generator (NumPy integer seeds are accepted too)
+        self.rng = random.Random(int(seed) if isinstance(seed, numbers.Integral) else seed)
+        self.num_ranks = num_ranks
+        self.first_rank = first_rank
+        self.num_decks = num_decks
+        self.ev_cache = ev_cache
+        self.num_flops = num_flops  # Number of community cards to reveal
+        self.game_mode = game_mode
+
+        self.num_bots = num_bots
+        self.num_players = self.num_bots + 1  # Total players = bots + 1 (the user)
+
+        self.player_position = self.rng.choice(range(self.num_players))  # Randomly assign player position
+
+        # Initialize the deck based on available suits
+        self.initialize_deck()
+        if self.num_players + self.num_flops > len(self.card_table):
+            raise ValueError("Not enough cards in the deck for every player and community card.")
+
+        # Track running totals of the deck so expected values are O(1) to query
+        self.deck_state = DeckState(self.deck, self.card_table)
+        self.flops = self.deck_state.flops  # Community cards
+
+        # Deal one card to each player (including the user)
+        self.cards = [self.deck_state.deal() for _ in range(self.num_players)]
+
+        self.ledger = TradeLedger()  # Player's trades, position and PnL
+
+        # Track inferred bot card values (initialize with None for each bot)
+        self.bot_card_estimates = [None] * self.num_bots
+
+        # Most recent quote from each bot, used to fill trades
+        self.quotes = [None] * self.num_bots
+
+        # How the bots make markets, and every bot's (bid, ask, volume) for the current round,
+        # drawn for all bots on the first request and kept until the next flop
+        self.bot_model = (bot_model or ClassicBots)(self)
+        self.quote_book = None
+
+        # Probability of every card for every bot, given what the player has seen
+        self.posterior = BotCardPosterior(self.card_table, self.num_bots, [self.player_card()],
+                                          self.bot_model.midpoint_noise)
+
+        # Bots whose market for the current round the player has already seen
+        self.observed = [False] * self.num_bots
+
+        # Record the configuration and deal, then every step of the session
+        self.recorder = log.start_session(self) if log is not None else None
+
+    def initialize_deck(self):
+        """Initialize the deck of integer-encoded cards based on available suits."""
+        # Look up the card value table for the chosen multipliers and deck shape (shared by identical games)
+        self.card_table = card_table(self.available_suits, self.multiplier_dict, self.num_ranks, self.first_rank,
+                                     self.num_decks)
+        # Shuffle once, seeded from the game's generator. Only the cards that will be dealt are drawn,
+        # so this costs the same for a deck of 39 cards or of tens of thousands
+        num_dealt = min(self.num_players + self.num_flops, len(self.card_table))
+        self.deck = np.random.default_rng(self.rng.getrandbits(64)).choice(len(self.card_table), num_dealt,
+                                                                            replace=False)
+
+    def calculate_expected_final_table(self):
+        """
+        Calculate the expected value of the final table from the player's perspective.
+
+        Returns:
+            float: Expected value of the final table.
+        """
+        # 1. Calculate the player's card value
+        player_card_value = self.card_value(self.cards[self.player_position])
+
+        # 2. Total value of revealed community cards (kept as a running sum)
+        community_value = self.deck_state.community_value
+
+        # 3. Calculate the expected value of unknown cards from the running deck totals
+        expected_value_per_card = self.deck_state.expected_value_per_card()
+
+        # Number of unknown cards: remaining community cards + bot cards
+        num_unknown_cards = self.num_flops - len(self.flops) + (self.num_players - 1)
+
+        # Expected value of all unknown cards
+        expected_value_unknown_cards = expected_value_per_card * num_unknown_cards
+
+        # 4. Calculate the final table expected value
+        final_table_expected_value = player_card_value + community_value + expected_value_unknown_cards
+
+        return final_table_expected_value
+
+    def card_value(self, card):
+        """Look up the value of a single integer-encoded card."""
+        return self.card_table.values[card]
+
+    def infer_bot_card_value(self, bid, ask):
+        """
+        Infer the bot's card value based on their bid and ask quotes.
+
+        Parameters:
+            bid (int): The bot's bid price.
+            ask (int): The bot's ask price.
+
+        Returns:
+            float: The inferred value of the bot's card.
+        """
+        # 1. Calculate the midpoint from the bid and ask
+        midpoint = (bid + ask) / 2
+
+        # 2. Total value of revealed community cards (kept as a running sum)
+        community_value = self.deck_state.community_value
+
+        # 3. Calculate the expected value of unknown cards from the running deck totals
+        expected_value_per_card = self.deck_state.expected_value_per_card()
+
+        # Number of unknown cards: remaining community cards + player cards
+        num_unknown_cards = self.num_flops - len(self.flops) + (self.num_players - 1)
+
+        # Expected value of all unknown cards
+        expected_value_unknown_cards = expected_value_per_card * num_unknown_cards
+
+        # 4. Infer the bot's card value
+        bot_card_value = midpoint - community_value - expected_value_unknown_cards
+
+        return bot_card_value
+
+    def get_final_table_components(self):
+        """
+        Calculate the components of the expected final table value.
+
+        Returns:
+            tuple: (player_card_value, community_value, inferred_bot_values_sum, expected_value_remaining_community_cards)
+        """
+        # 1. Calculate the player's card value
+        player_card_value = self.card_value(self.cards[self.player_position])
+
+        # 2. Total value of revealed community cards (kept as a running sum)
+        community_value = self.deck_state.community_value
+
+        # 3. Use the most recent inferred bot card values
+        inferred_bot_values = [
+            estimate for estimate in self.bot_card_estimates if estimate is not None
+        ]
+        inferred_bot_values_sum = sum(inferred_bot_values)
+
+        # 4. Calculate the expected value of remaining unknown cards from the running deck totals
+        expected_value_per_card = self.deck_state.expected_value_per_card()
+
+        # Number of remaining community cards (if any)
+        num_remaining_community_cards = self.num_flops - len(self.flops)
+
+        # Expected value of remaining community cards
+        expected_value_remaining_community_cards = expected_value_per_card * num_remaining_community_cards
+
+        return player_card_value, community_value, inferred_bot_values_sum, expected_value_remaining_community_cards
+
+    def calculate_expected_final_table_with_inferred_bots(self):
+        """
+        Calculate the expected value of the final table from the player's perspective,
+        using the most recent inferred bot card values.
+
+        Returns:
+            float: Expected value of the final table.
+        """
+        # Get all components using the helper method
+        player_card_value, community_value, inferred_bot_values_sum, expected_value_remaining_community_cards = (
+            self.get_final_table_components()
+        )
+
+        # Calculate the final table expected value
+        final_table_expected_value = (
+                player_card_value
+                + community_value
+                + inferred_bot_values_sum
+                + expected_value_remaining_community_cards
+        )
+
+        return final_table_expected_value
+
+    def final_table_distribution(self, full=False):
+        """
+        Exact mean and variance of the final table from the player's perspective.
+
+        Only the player's card and the revealed community cards are treated as known; the bot
+        cards and remaining community cards are drawn without replacement from everything else.
+
+        Parameters:
+            full (bool): Also compute the full distribution of the final table value.
+
+        Returns:
+            FinalTableDistribution: The mean, variance and (if `full`) the values and probabilities.
+        """
+        known_cards = [self.player_card()] + self.flops
+        num_unknown_cards = self.num_flops - len(self.flops) + self.num_bots
+        if full:
+            return final_table_distribution(self.card_table, known_cards, num_unknown_cards, self.ev_cache)
+        mean, variance = final_table_moments(self.card_table, known_cards, num_unknown_cards)
+        return FinalTableDistribution(mean, variance, None, None)
+
+    def player_card(self):
+        """Return the player's private card."""
+        return self.cards[self.player_position]
+
+    def bot_card(self, bot_index):
+        """Return a bot's private card. Bots hold the dealt cards other than the player's, in order."""
+        return self.cards[bot_index if bot_index < self.player_position else bot_index + 1]
+
+    def bot_market(self, bot_index):
+        """
+        Return a bot's market for the current round.
+
+        All bots' markets are drawn together the first time any bot is asked in a round, and
+        stay the same until the next `flop`.
+
+        Parameters:
+            bot_index (int): The index of the bot.
+
+        Returns:
+            tuple: (bid, ask, volume)
+        """
+        if self.quote_book is None:
+            self.quote_round()
+        return self.quote_book[bot_index]
+
+    def quote_round(self):
+        """Draw every bot's market for the current round with one call to the bot model."""
+        bids, asks, volumes = self.bot_model.quotes()
+        self.quote_book = list(zip(bids.tolist(), asks.tolist(), volumes.tolist()))
+
+    def quote(self, bot_index):
+        """
+        Ask a bot for its market and update the inferred value of its card.
+
+        Parameters:
+            bot_index (int): The index of the bot.
+
+        Returns:
+            Quote: The bot's bid, ask and volume, its inferred card value (the mean of the bot's
+            posterior, see `inference.BotCardPosterior`), and the expected value of the final table
+            (using the inferred bot values known before this quote).
+        """
+        bid, ask, volume = self.bot_market(bot_index)
+
+        # Calculate expected value of the final table using inferred bot card values
+        expected_value = self.calculate_expected_final_table_with_inferred_bots()
+
+        # Update the bot's posterior with its market (once per round, as repeated quotes carry no new information)
+        # and use the posterior mean as the bot's card estimate. The bot model's known skew of the midpoint
+        # (e.g., for the bot's inventory) is taken out first, so it is not mistaken for a different card.
+        if not self.observed[bot_index]:
+            inferred_value = self.infer_bot_card_value(bid, ask) - self.bot_model.skews[bot_index]
+            self.posterior.observe(bot_index, inferred_value)
+            self.observed[bot_index] = True
+        inferred_bot_card_value = self.posterior.mean(bot_index)
+        self.bot_card_estimates[bot_index] = inferred_bot_card_value
+
+        quote = Quote(bot_index, bid, ask, volume, inferred_bot_card_value, expected_value)
+        self.quotes[bot_index] = quote
+        if self.recorder is not None:
+            self.recorder.quote(quote)
+        return quote
+
+    def record_guess(self, question, guessed, actual):
+        """
+        Check one of the player's Hard mode guesses and record it in the game log.
+
+        Parameters:
+            question (int): POSITION_CHECK, FINAL_POSITION_GUESS or FINAL_PNL_GUESS.
+            guessed (int): The guessed position or PnL (None if the guess could not be parsed).
+            actual (int): The actual position or PnL.
+
+        Returns:
+            bool: Whether the guess was correct.
+        """
+        if self.recorder is not None:
+            self.recorder.guess(question, guessed, actual)
+        return guessed == actual
+
+    def trade(self, bot_index, size):
+        """
+        Trade against a bot's most recent quote.
+
+        Parameters:
+            bot_index (int): The index of the bot.
+            size (int): Positive to buy at the ask, negative to sell at the bid, 0 to skip.
+
+        Returns:
+            Fill: The executed size and price (price is None when the trade is skipped).
+        """
+        quote = self.quotes[bot_index]
+        if quote is None:
+            raise ValueError(f"Bot {bot_index + 1} has not quoted yet.")
+        if abs(size) > quote.volume:
+            raise ValueError(f"Invalid trade volume {size}: the bot's volume is {quote.volume}.")
+
+        if size < 0:
+            price = quote.bid
+        elif size > 0:
+            price = quote.ask
+        else:
+            price = None
+
+        fill = Fill(bot_index, size, price)
+        if size != 0:
+            self.ledger.record(size, price, bot_index, len(self.flops))
+            self.bot_model.record_fill(fill)
+        if self.recorder is not None:
+            self.recorder.trade(fill)
+        return fill
+
+    def flop(self):
+        """
+        Reveal a community card.
+
+        Returns:
+            int: The revealed card.
+        """
+        # Bots requote against the new community card
+        self.quote_book = None
+        self.observed = [False] * self.num_bots
+        card = self.deck_state.flop()
+        self.posterior.reveal(card)  # No bot can hold a revealed card
+        if self.recorder is not None:
+            self.recorder.flop(card)
+        return card
+
+    @property
+    def position(self):
+        """The player's net position from all trades."""
+        return self.ledger.position
+
+    @property
+    def pnl(self):
+        """The player's PnL from all trades, as reported at settlement (sum of size * price)."""
+        return self.ledger.cash
+
+    def current_position(self):
+        """Return the player's net position from all trades."""
+        return self.ledger.position
+
+    def mark_to_market(self):
+        """Return the player's PnL marked at the current expected final table (using inferred bot values)."""
+        return self.ledger.mark_to_market(self.calculate_expected_final_table_with_inferred_bots())
+
+    def settle(self):
+        """
+        Settle the game against the actual final table.
+
+        Returns:
+            Settlement: The player's final position, PnL and the final table value.
+        """
+        # Calculate the player's actual PnL and position
+        actual_position = self.ledger.position  # Net position from trades
+        actual_pnl = self.ledger.cash  # Total PnL from trades
+
+        # Calculate the final table value
+        # 1. Player card value
+        player_card_value = self.card_value(self.player_card())
+
+        # 2. Community card values
+        community_value = self.deck_state.community_value
+
+        # 3. Bot card values
+        bot_card_values = [self.card_value(self.bot_card(i)) for i in range(self.num_bots)]
+
+        # 4. Final table value
+        final_table_value = player_card_value + community_value + sum(bot_card_values)
+
+        settlement = Settlement(actual_position, actual_pnl, final_table_value)
+        if self.recorder is not None:
+            self.recorder.settle(settlement)
+        return settlement
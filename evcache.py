@@ -0,0 +1,193 @@
+"""
+Disk cache of precomputed final table distributions.
+
+The exact distribution of the final table (`distribution.final_table_distribution`) depends
+only on the deck's multiset of card values, the values already known and the number of unknown
+cards. It takes a DP over every reachable sum, from a millisecond for the standard deck to
+hundreds of milliseconds with many bots. `EVCache` stores every result on disk, keyed by a hash
+of the deck and of the state, so new processes (e.g., batch workers) start warm instead of
+recomputing them, and `precompute` fills it ahead of time for common presets:
+
+    python evcache.py ~/.cache/market-making --preset standard --bots 1 4 10 --depth 1
+
+Pass the cache to `Engine(ev_cache=...)` (or to `final_table_distribution`) to use it. Entries
+are evicted least recently used first once the cache grows past `max_bytes`.
+"""
+import argparse
+import hashlib
+import os
+import zipfile
+from itertools import combinations_with_replacement
+
+import numpy as np
+
+from deck import NUM_RANKS, card_table
+from distribution import unknown_sum_distribution
+from engine import DEFAULT_MULTIPLIERS, DEFAULT_SUITS
+
+# Common setups: (suits, multipliers). 'standard' is the default of `Game.setup_suits_and_multipliers`.
+PRESETS = {
+    'standard': (DEFAULT_SUITS, DEFAULT_MULTIPLIERS),
+    'full': (['d', 'c', 'h', 's'], DEFAULT_MULTIPLIERS),
+    'positive': (['c', 's'], DEFAULT_MULTIPLIERS),
+}
+
+
+def config_hash(card_table):
+    """Hash a deck by its multiset of card values, so decks that only differ in suit names share entries."""
+    digest = hashlib.sha256(card_table.distinct_values.tobytes())
+    digest.update(card_table.value_counts.tobytes())
+    return digest.hexdigest()[:16]
+
+
+class EVCache:
+    """
+    Directory of precomputed final table distributions, one `.npz` file per (deck, state).
+
+    Writes are atomic (a temporary file renamed into place), so several processes can share a
+    cache directory.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 2 ** 20):
+        """
+        Parameters:
+            directory (str): Cache directory (created if missing).
+            max_bytes (int): Size above which the least recently used entries are evicted.
+        """
+        self.directory = os.path.expanduser(directory)
+        self.max_bytes = max_bytes
+        self._size = None  # Running estimate of the cache size, so writes do not rescan the directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, card_table, known_values, num_unknown_cards):
+        """Return the file of one state: the deck hash followed by a hash of the known values and unknown count."""
+        state = hashlib.sha256(repr((tuple(sorted(known_values)), num_unknown_cards)).encode()).hexdigest()[:16]
+        return os.path.join(self.directory, f"{config_hash(card_table)}-{state}.npz")
+
+    def get(self, card_table, known_values, num_unknown_cards):
+        """
+        Read a cached distribution.
+
+        Returns:
+            tuple: (sums, probabilities), or None if the state is not cached.
+        """
+        path = self.path(card_table, known_values, num_unknown_cards)
+        try:
+            with np.load(path) as data:
+                sums, probabilities = data['sums'], data['probabilities']
+            os.utime(path)  # Mark as recently used
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+        return sums, probabilities
+
+    def put(self, card_table, known_values, num_unknown_cards, sums, probabilities):
+        """Store a distribution, then evict old entries if the cache is over its size limit."""
+        path = self.path(card_table, known_values, num_unknown_cards)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as f:
+            np.savez(f, sums=sums, probabilities=probabilities)
+        os.replace(temporary, path)
+
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += os.path.getsize(path)
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def entries(self):
+        """Return (last used time, size, path) of every cached entry."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npz'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:  # Evicted by another process
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def size(self):
+        """Total size of the cached entries in bytes."""
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Delete the least recently used entries until the cache fits in `max_bytes`."""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._size = total
+
+    def clear(self):
+        """Delete every cached entry."""
+        for _, _, path in self.entries():
+            os.remove(path)
+        self._size = 0
+
+
+def precompute(cache, suits, multipliers, bot_counts, num_flops=4, depth=0, num_ranks=NUM_RANKS, first_rank=1,
+               num_decks=1):
+    """
+    Fill the cache with the final table distributions a game with this deck can ask for.
+
+    For every number of bots, the player's card can be any value and `r` community cards may
+    already be revealed; every multiset of those known values for r = 0..depth is one state.
+
+    Parameters:
+        cache (EVCache): The cache to fill.
+        suits (list): Suit names of the deck.
+        multipliers (dict): Multiplier for each suit.
+        bot_counts (list): Numbers of bots to precompute for.
+        num_flops (int): Number of community cards.
+        depth (int): Number of revealed community cards to precompute states for (the number of
+            states grows like (distinct values) ** (depth + 1)).
+        num_ranks, first_rank, num_decks: Deck shape, as for `Engine`.
+
+    Returns:
+        int: Number of states computed (states already cached are skipped).
+    """
+    table = card_table(suits, multipliers, num_ranks, first_rank, num_decks)
+    counts = dict(zip(table.distinct_values.tolist(), table.value_counts.tolist()))
+    computed = 0
+    for num_bots in bot_counts:
+        for revealed in range(min(depth, num_flops) + 1):
+            num_unknown_cards = num_bots + num_flops - revealed
+            for known_values in combinations_with_replacement(sorted(counts), revealed + 1):
+                # Skip multisets that use more cards of a value than the deck has
+                if any(known_values.count(value) > counts[value] for value in set(known_values)):
+                    continue
+                if num_unknown_cards > len(table) - len(known_values):
+                    continue
+                if cache.get(table, known_values, num_unknown_cards) is None:
+                    sums, probabilities = unknown_sum_distribution(table, known_values, num_unknown_cards)
+                    cache.put(table, known_values, num_unknown_cards, sums, probabilities)
+                    computed += 1
+    return computed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute final table distributions into a disk cache.")
+    parser.add_argument('directory', help="cache directory")
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='standard', help="deck (default: standard)")
+    parser.add_argument('--bots', type=int, nargs='+', default=[4], help="numbers of bots (default: 4)")
+    parser.add_argument('--flops', type=int, default=4, help="number of community cards (default: 4)")
+    parser.add_argument('--depth', type=int, default=0, help="revealed community cards to cover (default: 0)")
+    parser.add_argument('--max-bytes', type=int, default=256 * 2 ** 20, help="cache size limit (default: 256 MiB)")
+    args = parser.parse_args(argv)
+
+    cache = EVCache(args.directory, args.max_bytes)
+    suits, multipliers = PRESETS[args.preset]
+    computed = precompute(cache, suits, multipliers, args.bots, args.flops, args.depth)
+    cache.evict()
+    print(f"Computed {computed} states; cache size {cache.size() / 2 ** 20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
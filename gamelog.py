@@ -0,0 +1,277 @@
+"""
+Compact binary game logs and replay.
+
+A log file is an append-only sequence of fixed-width records (`RECORD_DTYPE`, 39 bytes each).
+Every event of a session is one record, numbered by its step within the session:
+
+    kind      bot             a                b              c
+    CONFIG    -               num_bots         num_flops      game_mode
+    SEED      -               seed (int64)     -              -
+    SUIT      suit index      suit name (*)    multiplier     num_ranks
+    DECK      -               first_rank       num_decks      num_ranks
+    DEAL      bot (-1=you)    card             card value     -
+    QUOTE     bot             bid              ask            volume
+    INFER     bot             inferred card value * INFERENCE_SCALE (rounded)
+    TRADE     bot             size             price          -
+    FLOP      -               card             -              -
+    SETTLE    -               position         pnl            final table value
+    GUESS     question        guess            actual         1 if correct
+
+(*) Suit names of up to 8 UTF-8 bytes, packed little-endian into the integer (so a
+one-letter suit is stored as `ord(suit)`); see `encode_suit` and `decode_suit`.
+
+Files are read back with `np.memmap`, so reading never parses records into Python objects
+until a single session is replayed.
+"""
+import numbers
+from collections import namedtuple
+
+import numpy as np
+
+from deck import CardTable
+from engine import Settlement
+
+RECORD_DTYPE = np.dtype([
+    ('session', '<u8'),
+    ('step', '<u4'),
+    ('kind', 'u1'),
+    ('bot', '<i2'),
+    ('a', '<i8'),
+    ('b', '<i8'),
+    ('c', '<i8'),
+])
+
+CONFIG, SEED, SUIT, DEAL, QUOTE, TRADE, FLOP, SETTLE, INFER, GUESS, DECK = range(11)
+
+INFERENCE_SCALE = 1000  # Inferred bot card values are stored in thousandths
+UNPARSED_GUESS = np.iinfo(np.int64).min  # Stored for guesses that could not be parsed
+
+# A game's state as of one step of its log
+ReplayState = namedtuple('ReplayState', [
+    'session', 'step', 'num_bots', 'num_flops', 'game_mode', 'seed', 'suits', 'multipliers', 'num_ranks',
+    'first_rank', 'num_decks', 'player_position', 'cards', 'flops', 'quotes', 'bot_card_estimates', 'trades',
+    'position', 'pnl', 'settlement', 'guesses',
+])
+
+
+def _to_int64(value):
+    """Store an unsigned 64-bit seed in a signed field."""
+    value &= 0xFFFFFFFFFFFFFFFF
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _from_int64(value):
+    """Recover an unsigned 64-bit seed from a signed field."""
+    return value + (1 << 64) if value < 0 else value
+
+
+def encode_suit(suit):
+    """Pack a suit name of up to 8 UTF-8 bytes into a signed 64-bit field."""
+    data = suit.encode()
+    if len(data) > 8:
+        raise ValueError(f"Suit name {suit!r} is too long to log (at most 8 bytes).")
+    return int.from_bytes(data, 'little', signed=len(data) == 8)
+
+
+def decode_suit(code):
+    """Unpack a suit name stored by `encode_suit`."""
+    return code.to_bytes(8, 'little', signed=True).rstrip(b'\0').decode()
+
+
+class GameLog:
+    """
+    Append-only writer for binary game logs.
+
+    Pass it to `Engine(log=...)` and the engine records its configuration, seed, deal, quotes,
+    inferred bot values, trades, flops, settlement and Hard mode guesses. Records are buffered
+    and appended to the file in blocks.
+    """
+
+    def __init__(self, path, buffer_size=65536):
+        """
+        Parameters:
+            path (str): Log file. Records are appended if it already exists.
+            buffer_size (int): Number of records buffered before writing to disk.
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self.buffer = []
+        self.file = open(path, 'ab')
+
+        # Continue numbering sessions after the last one already in the file
+        existing = np.memmap(path, dtype=RECORD_DTYPE, mode='r') if self.file.tell() else []
+        self.next_session = int(existing['session'].max()) + 1 if len(existing) else 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def start_session(self, game):
+        """
+        Record a new game's configuration and deal.
+
+        Parameters:
+            game (Engine): The newly dealt game.
+
+        Returns:
+            SessionRecorder: Recorder for the rest of the game's events.
+        """
+        recorder = SessionRecorder(self, self.next_session)
+        self.next_session += 1
+
+        recorder.write(CONFIG, 0, game.num_bots, game.num_flops, game.game_mode)
+        if isinstance(game.seed, numbers.Integral):  # Including NumPy integers
+            recorder.write(SEED, 0, _to_int64(int(game.seed)))
+        for suit_index, suit in enumerate(game.available_suits):
+            recorder.write(SUIT, suit_index, encode_suit(suit), game.multiplier_dict[suit], game.card_table.num_ranks)
+        recorder.write(DECK, 0, game.card_table.first_rank, game.card_table.num_decks, game.card_table.num_ranks)
+        for seat, card in enumerate(game.cards):
+            bot_index = -1 if seat == game.player_position else seat - (seat > game.player_position)
+            recorder.write(DEAL, bot_index, card, game.card_value(card))
+        return recorder
+
+    def append(self, record):
+        """Buffer one record, writing the buffer out when it is full."""
+        self.buffer.append(record)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """Write all buffered records to disk."""
+        if self.buffer:
+            self.file.write(np.array(self.buffer, dtype=RECORD_DTYPE).tobytes())
+            self.buffer = []
+        self.file.flush()
+
+    def close(self):
+        """Flush and close the log file."""
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
+
+
+class SessionRecorder:
+    """Records the events of one session into a `GameLog`."""
+
+    def __init__(self, log, session):
+        self.log = log
+        self.session = session
+        self.step = 0
+
+    def write(self, kind, bot=0, a=0, b=0, c=0):
+        """Append one record for this session."""
+        self.log.append((self.session, self.step, kind, bot, a, b, c))
+        self.step += 1
+
+    def quote(self, quote):
+        self.write(QUOTE, quote.bot_index, quote.bid, quote.ask, quote.volume)
+        self.write(INFER, quote.bot_index, round(quote.inferred_value * INFERENCE_SCALE))
+
+    def trade(self, fill):
+        self.write(TRADE, fill.bot_index, fill.size, fill.price or 0)
+
+    def flop(self, card):
+        self.write(FLOP, 0, card)
+
+    def settle(self, settlement):
+        self.write(SETTLE, 0, settlement.position, settlement.pnl, settlement.final_table_value)
+
+    def guess(self, question, guessed, actual):
+        self.write(GUESS, question, UNPARSED_GUESS if guessed is None else guessed, actual, int(guessed == actual))
+
+
+class GameReplay:
+    """
+    Memory-mapped reader that reconstructs any session's state at any step.
+
+    Nothing is re-simulated: the state is rebuilt purely from the recorded events.
+    """
+
+    def __init__(self, path):
+        """
+        Parameters:
+            path (str): Log file written by `GameLog`.
+        """
+        self.records = np.memmap(path, dtype=RECORD_DTYPE, mode='r')
+
+        # Index the records by session (a stable sort keeps each session's records in step order)
+        sessions = self.records['session']
+        self.order = np.argsort(sessions, kind='stable')
+        self.sessions, self.starts, self.counts = np.unique(sessions[self.order], return_index=True,
+                                                            return_counts=True)
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def session_records(self, session):
+        """Return the records of one session, in step order."""
+        i = np.searchsorted(self.sessions, session)
+        if i == len(self.sessions) or self.sessions[i] != session:
+            raise KeyError(f"Session {session} is not in the log.")
+        return self.records[self.order[self.starts[i]:self.starts[i] + self.counts[i]]]
+
+    def card_table(self, state):
+        """Build the card table of a replayed state, e.g. to render card names."""
+        return CardTable(state.suits, state.multipliers, state.num_ranks, state.first_rank, state.num_decks)
+
+    def state(self, session, step=None):
+        """
+        Reconstruct a session's state.
+
+        Parameters:
+            session (int): Session id.
+            step (int): Last step to apply (default: the end of the session).
+
+        Returns:
+            ReplayState: The game as of that step.
+        """
+        records = self.session_records(session)
+        if step is not None:
+            records = records[records['step'] <= step]
+
+        num_bots = num_flops = game_mode = seed = num_ranks = None
+        first_rank = num_decks = 1  # Logs written before DECK records only had standard decks
+        suits, multipliers = [], {}
+        player_position, cards, flops, trades = None, [], [], []
+        quotes, bot_card_estimates, guesses, settlement = [], [], [], None
+        position = pnl = 0
+
+        for _, record_step, kind, bot, a, b, c in records.tolist():
+            if kind == CONFIG:
+                num_bots, num_flops, game_mode = a, b, c
+                quotes = [None] * num_bots
+                bot_card_estimates = [None] * num_bots
+            elif kind == SEED:
+                seed = _from_int64(a)
+            elif kind == SUIT:
+                suits.append(decode_suit(a))
+                multipliers[suits[-1]] = b
+                num_ranks = c
+            elif kind == DECK:
+                first_rank, num_decks, num_ranks = a, b, c
+            elif kind == DEAL:
+                if bot == -1:
+                    player_position = len(cards)
+                cards.append(a)
+            elif kind == QUOTE:
+                quotes[bot] = (a, b, c)
+            elif kind == INFER:
+                bot_card_estimates[bot] = a / INFERENCE_SCALE
+            elif kind == TRADE:
+                trades.append((bot, a, b))
+                position += a
+                pnl += a * b
+            elif kind == FLOP:
+                flops.append(a)
+            elif kind == SETTLE:
+                settlement = Settlement(a, b, c)
+            elif kind == GUESS:
+                guesses.append((bot, None if a == UNPARSED_GUESS else a, b, bool(c)))
+
+        last_step = int(records['step'][-1]) if len(records) else -1
+        return ReplayState(session, last_step, num_bots, num_flops, game_mode, seed, suits, multipliers, num_ranks,
+                           first_rank, num_decks, player_position, cards, flops, quotes, bot_card_estimates, trades,
+                           position, pnl, settlement, guesses)
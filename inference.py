@@ -0,0 +1,142 @@
+import numpy as np
+
+
+class BotCardPosterior:
+    """
+    Posterior probability of every possible card for every bot, updated incrementally.
+
+    Cards with the same value are interchangeable here, so beliefs are kept per distinct card
+    value: a (bots, values) matrix of log-likelihoods from the quotes, and one shared count of
+    the cards of each value the player cannot see (everything but their own card and the flops).
+    A bot's posterior for a value is its likelihood times that count. Each new quote adds to
+    the bot's row, and each flop decrements one count for all bots at once, so a turn costs
+    O(distinct values) and memory does not grow with the number of copies of the deck.
+
+    The bots' cards are dealt without replacement, so a card that one bot very likely holds is
+    unlikely for the others. Each bot's counts have the other bots' expected holdings taken
+    out: the sum of their posteriors computed on their own, clipped so no count drops below a
+    small share of itself. This is a one-step mean-field approximation of the joint posterior
+    over every bot's card, which would be exponential in the number of bots.
+
+    The observation for a quote is the point estimate from `Engine.infer_bot_card_value`. That
+    estimate differs from the bot's true card value by the bot model's random shift of its
+    midpoint (`BotModel.midpoint_noise`) plus the truncation of the bid and ask to integers,
+    which moves the midpoint by less than 1. The likelihood is the known shift distribution
+    spread over that rounding with a triangular kernel, with a small floor so an observation
+    just outside the kernel cannot rule out the true card.
+    """
+
+    def __init__(self, card_table, num_bots, known_cards, midpoint_noise=None, floor=1e-6):
+        """
+        Parameters:
+            card_table (CardTable): Value table of the deck.
+            num_bots (int): Number of bots.
+            known_cards (list): Cards the player can see, which no bot can hold.
+            midpoint_noise (dict): Probability of each random shift of a bot's midpoint (default: none).
+            floor (float): Smallest likelihood of any card for one observation.
+        """
+        self.values = card_table.distinct_values.astype(np.float64)
+        self.value_index = card_table.value_index
+        midpoint_noise = {0: 1.0} if midpoint_noise is None else midpoint_noise
+        self.shifts = np.array(list(midpoint_noise), dtype=np.float64)
+        self.shift_probabilities = np.array(list(midpoint_noise.values()), dtype=np.float64)
+        self.floor = floor
+        self.log_likelihood = np.zeros((num_bots, len(self.values)))
+
+        # Number of cards of each value that any bot could hold
+        self.counts = card_table.value_counts.astype(np.float64)
+        np.subtract.at(self.counts, self.value_index[list(known_cards)], 1)
+        with np.errstate(divide='ignore'):
+            self.log_counts = np.log(self.counts)
+
+        # Cached posterior means; NaN marks a bot whose beliefs changed since the last query
+        self._means = np.full(num_bots, np.nan)
+
+        # Each bot's posterior on its own (as if it were the only bot), refreshed row by row, and
+        # their sum over bots: the expected number of cards of each value held by the bots
+        self._own = np.zeros((num_bots, len(self.values)))
+        self._stale = np.ones(num_bots, dtype=bool)
+        self._holdings = np.zeros(len(self.values))
+
+    def observe(self, bot_indices, inferred_values):
+        """
+        Update the beliefs about one or more bots with new quotes.
+
+        Parameters:
+            bot_indices (int or array): The bot(s) that quoted.
+            inferred_values (float or array): The inferred card value from each quote.
+        """
+        bot_indices = np.atleast_1d(bot_indices)
+        inferred_values = np.atleast_1d(np.asarray(inferred_values, dtype=np.float64))
+        rows = self.log_likelihood[bot_indices]
+        # Distance of each observation from each card value and each possible shift, (quotes, values, shifts)
+        errors = inferred_values[:, None, None] - self.values[None, :, None] - self.shifts
+        likelihood = np.maximum(1 - np.abs(errors), 0) @ self.shift_probabilities
+        rows += np.log(np.maximum(likelihood, self.floor))
+        # Keep the largest log-likelihood at 0 so repeated updates never underflow
+        rows -= rows.max(axis=1, keepdims=True)
+        self.log_likelihood[bot_indices] = rows
+        self._stale[bot_indices] = True
+        self._means[:] = np.nan  # Every other bot's counts depend on this bot's beliefs
+
+    def reveal(self, card):
+        """Take a card that has been revealed to everyone (e.g., a flop) out of every bot's posterior."""
+        i = self.value_index[card]
+        self.counts[i] -= 1
+        with np.errstate(divide='ignore'):
+            self.log_counts[i] = np.log(self.counts[i])
+        self._stale[:] = True
+        self._means[:] = np.nan
+
+    def _weights(self, log_likelihood):
+        """Unnormalized posterior weights of each value for rows of log-likelihoods."""
+        log_posterior = log_likelihood + self.log_counts
+        return np.exp(log_posterior - log_posterior.max(axis=-1, keepdims=True))
+
+    def _update_holdings(self):
+        """Refresh the stale bots' own posteriors and the bots' expected holdings of each value."""
+        stale = self._stale
+        if not stale.any():
+            return
+        weights = self._weights(self.log_likelihood[stale])
+        rows = weights / weights.sum(axis=1, keepdims=True)
+        if stale.all():
+            self._holdings = rows.sum(axis=0)  # Start over so rounding errors never build up
+        else:
+            self._holdings += rows.sum(axis=0) - self._own[stale].sum(axis=0)
+        self._own[stale] = rows
+        stale[:] = False
+
+    def _joint_weights(self, bot_indices):
+        """Unnormalized posterior weights of each value for some bots, net of the other bots' holdings."""
+        self._update_holdings()
+        others = self._holdings - self._own[bot_indices]
+        counts = np.maximum(self.counts - others, 1e-3 * self.counts)
+        with np.errstate(divide='ignore'):
+            log_posterior = self.log_likelihood[bot_indices] + np.log(counts)
+        return np.exp(log_posterior - log_posterior.max(axis=-1, keepdims=True))
+
+    def probabilities(self):
+        """
+        Return the normalized posterior of every bot over the distinct card values (`values`).
+
+        Returns:
+            np.ndarray: Shape (bots, values); each row sums to 1.
+        """
+        weights = self._joint_weights(np.arange(len(self.log_likelihood)))
+        return weights / weights.sum(axis=1, keepdims=True)
+
+    def means(self):
+        """Return the posterior mean card value of every bot, recomputing only the stale ones."""
+        stale = np.flatnonzero(np.isnan(self._means))
+        if len(stale):
+            weights = self._joint_weights(stale)
+            self._means[stale] = weights @ self.values / weights.sum(axis=1)
+        return self._means
+
+    def mean(self, bot_index):
+        """Return the posterior mean card value of one bot."""
+        if np.isnan(self._means[bot_index]):
+            weights = self._joint_weights(bot_index)
+            self._means[bot_index] = weights @ self.values / weights.sum()
+        return float(self._means[bot_index])
@@ -0,0 +1,56 @@
+from array import array
+
+
+class TradeLedger:
+    """
+    The player's fills, with position and cash kept up to date on every fill.
+
+    Fills are stored column by column in compact arrays (size, price, bot and round) rather
+    than as a list of tuples, and the net position and cash are running totals, so querying
+    them after any trade is O(1).
+    """
+
+    def __init__(self):
+        self.sizes = array('q')  # Signed trade sizes (positive = bought)
+        self.prices = array('q')  # Fill prices
+        self.bots = array('l')  # Index of the bot traded with
+        self.rounds = array('l')  # Number of community cards revealed at the time of the fill
+
+        self.position = 0  # Net position in lots
+        self.cash = 0  # Sum of size * price over all fills (the PnL reported at settlement)
+
+    def __len__(self):
+        return len(self.sizes)
+
+    def record(self, size, price, bot_index, round_index):
+        """
+        Record a fill.
+
+        Parameters:
+            size (int): Positive to buy at the ask, negative to sell at the bid.
+            price (int): The fill price.
+            bot_index (int): The index of the bot traded with.
+            round_index (int): Number of community cards revealed.
+        """
+        self.sizes.append(size)
+        self.prices.append(price)
+        self.bots.append(bot_index)
+        self.rounds.append(round_index)
+        self.position += size
+        self.cash += size * price
+
+    def mark_to_market(self, value):
+        """
+        Return the PnL of the current position marked at `value`.
+
+        Parameters:
+            value (float): Current estimate of the final table value.
+
+        Returns:
+            float: position * value - cash
+        """
+        return self.position * value - self.cash
+
+    def fills(self):
+        """Iterate over the fills as (size, price, bot_index, round_index) tuples."""
+        return zip(self.sizes, self.prices, self.bots, self.rounds)
@@ -0,0 +1,100 @@
+import functools
+import math
+import time
+from collections import namedtuple
+
+from engine import Engine
+
+# The hot paths of a session
+PROFILED_METHODS = ('quote_round', 'infer_bot_card_value', 'get_final_table_components', 'flop', 'settle')
+
+# Timing summary of one method, in seconds
+ProfileStats = namedtuple('ProfileStats', ['calls', 'total', 'mean', 'p99'])
+
+
+class Profiler:
+    """
+    Time and count calls to the engine's hot paths.
+
+    Use it as a context manager. On entry the profiled `Engine` methods are replaced with timed
+    wrappers, and on exit the originals are restored, so there is no overhead at all outside the
+    `with` block (or when `enabled` is False). Reuse one profiler across several `with` blocks
+    to aggregate timings over many sessions.
+
+    Only calls made in this process are timed; sessions run in worker processes are not.
+
+        with Profiler() as profiler:
+            play_game(EVThreshold(), seed=0)
+        print(profiler.format_report())
+    """
+
+    def __init__(self, methods=PROFILED_METHODS, enabled=True):
+        """
+        Parameters:
+            methods (tuple): Names of the `Engine` methods to time.
+            enabled (bool): If False, entering the profiler does nothing.
+        """
+        self.methods = methods
+        self.enabled = enabled
+        self.timings = {name: [] for name in methods}  # Duration of every call, per method
+        self._originals = {}
+
+    def __enter__(self):
+        if not self.enabled:
+            return self
+        if self._originals:
+            raise RuntimeError("The profiler is already active.")
+        for name in self.methods:
+            original = getattr(Engine, name)
+            self._originals[name] = original
+            setattr(Engine, name, self._timed(name, original))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for name, original in self._originals.items():
+            setattr(Engine, name, original)
+        self._originals = {}
+        return False
+
+    def _timed(self, name, method):
+        """Wrap a method so every call appends its duration to the method's timings."""
+        timings = self.timings[name]
+        clock = time.perf_counter
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                timings.append(clock() - start)
+
+        return timed
+
+    def reset(self):
+        """Discard all recorded timings."""
+        for timings in self.timings.values():
+            timings.clear()
+
+    def report(self):
+        """
+        Summarize the recorded timings.
+
+        Returns:
+            dict: ProfileStats (calls, total, mean and p99 latency in seconds) for each method.
+        """
+        report = {}
+        for name, timings in self.timings.items():
+            calls = len(timings)
+            total = sum(timings)
+            p99 = sorted(timings)[math.ceil(0.99 * calls) - 1] if calls else 0
+            report[name] = ProfileStats(calls, total, total / calls if calls else 0, p99)
+        return report
+
+    def format_report(self):
+        """Format the timing report as a table (latencies in microseconds)."""
+        lines = [f"{'Method':<30}{'Calls':>10}{'Total (ms)':>14}{'Mean (us)':>12}{'p99 (us)':>12}"]
+        for name, stats in self.report().items():
+            lines.append(f"{name:<30}{stats.calls:>10}{stats.total * 1e3:>14.3f}{stats.mean * 1e6:>12.2f}"
+                         f"{stats.p99 * 1e6:>12.2f}")
+        return '\n'.join(lines)
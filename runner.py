@@ -0,0 +1,87 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from engine import Engine
+from strategies import taker_info
+
+
+def session_seed(seed, session_index):
+    """
+    Derive an independent seed for one session from a root seed.
+
+    Each session gets its own `np.random.SeedSequence` child stream keyed by its index, so a
+    session's outcome depends only on (seed, session_index), never on which worker runs it.
+
+    Parameters:
+        seed (int): Root seed of the run.
+        session_index (int): Index of the session within the run.
+
+    Returns:
+        int: Seed for the session's `random.Random`.
+    """
+    return int(np.random.SeedSequence(seed, spawn_key=(session_index,)).generate_state(1, np.uint64)[0])
+
+
+def play_game(strategy, seed=None, **config):
+    """
+    Play one game with an automated taker, following the same rounds as `Game.start`.
+
+    Parameters:
+        strategy (Strategy): The automated taker.
+        seed: Seed for the game's random number generator.
+        **config: Any other `Engine` arguments (num_bots, suits, multipliers, num_flops, ...).
+
+    Returns:
+        Settlement: The final position, PnL and final table value.
+    """
+    game = Engine(seed=seed, **config)
+    for round_index in range(game.num_flops + 1):
+        for bot_index in range(game.num_bots):
+            quote = game.quote(bot_index)
+            game.trade(bot_index, strategy.trade_size(quote, taker_info(game)))
+
+        # Reveal the next community card (the last round is played with all cards revealed)
+        if round_index < game.num_flops:
+            game.flop()
+
+    return game.settle()
+
+
+def _run_chunk(strategy, seed, start, stop, config):
+    """Play sessions start..stop-1 in one worker process."""
+    return [play_game(strategy, session_seed(seed, i), **config) for i in range(start, stop)]
+
+
+def run_sessions(strategy, num_sessions, seed=0, workers=None, chunk_size=None, **config):
+    """
+    Play many seeded sessions with an automated taker, spread across a process pool.
+
+    Parameters:
+        strategy (Strategy): The automated taker. It must be picklable.
+        num_sessions (int): Number of sessions to play.
+        seed (int): Root seed. Session i is seeded with `session_seed(seed, i)`.
+        workers (int): Number of worker processes (default: all cores). 1 runs in this process.
+        chunk_size (int): Sessions per task sent to a worker (default: about 4 tasks per worker).
+        **config: Any other `Engine` arguments.
+
+    Returns:
+        list: The Settlement of every session, in session order. The results are identical
+        for any number of workers.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return _run_chunk(strategy, seed, 0, num_sessions, config)
+
+    chunk_size = chunk_size or max(1, math.ceil(num_sessions / (workers * 4)))
+    starts = range(0, num_sessions, chunk_size)
+    stops = [min(start + chunk_size, num_sessions) for start in starts]
+
+    settlements = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk in executor.map(_run_chunk, [strategy] * len(starts), [seed] * len(starts), starts, stops,
+                                  [config] * len(starts)):
+            settlements.extend(chunk)
+    return settlements
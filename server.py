@@ -0,0 +1,236 @@
+"""
+Asyncio host that runs many concurrent game sessions in one process.
+
+Each TCP connection is one player and one session, played over a plain line-based protocol
+(so `nc localhost 8765` or `telnet` is enough to play). The server writes prompts ending in
+": " and the player answers with one line. A session only advances when its player's answer
+arrives; quoting, trading and settlement run directly on the event loop, and an idle session
+is just a suspended coroutine waiting for its next line.
+
+Sessions show the same rules, markets, Easy mode breakdowns and Hard mode feedback as the
+command-line game (the text comes from the same functions in `main.py`). Only the setup is
+shorter: the suits and multipliers are entered on one line instead of suit by suit.
+
+    python server.py --port 8765 --log sessions.log
+"""
+import argparse
+import asyncio
+
+from engine import HARD, POSITION_CHECK, Engine, describe_position, parse_position
+from main import fill_line, final_check_lines, final_guess_lines, market_lines, rules_lines
+
+
+class PlayerSession:
+    """One player's game, driven by lines read from their connection."""
+
+    def __init__(self, reader, writer, log=None, idle_timeout=None):
+        """
+        Parameters:
+            reader (asyncio.StreamReader): The player's input.
+            writer (asyncio.StreamWriter): The player's output.
+            log (GameLog): Binary log shared by all sessions (optional).
+            idle_timeout (float): Seconds to wait for an answer before closing the session.
+        """
+        self.reader = reader
+        self.writer = writer
+        self.log = log
+        self.idle_timeout = idle_timeout
+        self.game = None
+
+    async def send(self, *lines):
+        """Send lines of text to the player."""
+        self.writer.write(''.join(f"{line}\n" for line in lines).encode())
+        await self.writer.drain()
+
+    async def ask(self, prompt):
+        """Prompt the player and wait for their answer."""
+        self.writer.write(prompt.encode())
+        await self.writer.drain()
+        line = await asyncio.wait_for(self.reader.readline(), self.idle_timeout)
+        if not line:
+            raise ConnectionResetError("The player disconnected.")
+        return line.decode(errors='replace').strip()  # Undecodable bytes become invalid answers
+
+    async def ask_int(self, prompt, default=None, valid=None, error="Invalid input. Please enter a valid number.",
+                      parse_error=None):
+        """Prompt until the player answers with an integer accepted by `valid`."""
+        while True:
+            answer = await self.ask(prompt)
+            try:
+                value = int(answer) if answer or default is None else default
+            except ValueError:
+                await self.send(parse_error or error)
+                continue
+            if valid is None or valid(value):
+                return value
+            await self.send(error)
+
+    async def ask_num_bots(self):
+        """Prompt for the number of bots."""
+        return await self.ask_int("Enter the number of bots in the game (default: 4): ", default=4,
+                                  valid=lambda n: n >= 1, error="You must have at least 1 bot. Try again.",
+                                  parse_error="Invalid input. Please enter a valid number.")
+
+    async def ask_multipliers(self):
+        """Prompt for the suits and their multipliers until they parse (empty for the defaults)."""
+        while True:
+            answer = await self.ask("Suits and multipliers (e.g., 'c:10 h:-10 s:10', blank for the defaults): ")
+            try:
+                multipliers = {}
+                for token in answer.lower().split():
+                    suit, multiplier = token.split(':')
+                    multipliers[suit] = int(multiplier)
+                return multipliers
+            except ValueError as e:
+                await self.send(f"Invalid setup ({e}). Use suit:multiplier pairs separated by spaces.")
+
+    async def setup(self):
+        """Ask for the session's configuration and deal the game."""
+        num_bots = await self.ask_num_bots()
+        await self.send(
+            "",
+            "--- Choose Game Difficulty ---",
+            "1. Easy: Hints are provided.",
+            "2. Normal: No hints, no assessments.",
+            "3. Hard: The game will ask you questions at random moments.",
+            "----------------------------------",
+        )
+        game_mode = await self.ask_int("Enter the difficulty level (1 for Easy, 2 for Normal, 3 for Hard): ",
+                                       valid=lambda mode: mode in (1, 2, 3),
+                                       error="Invalid choice. Please enter 1, 2, or 3.",
+                                       parse_error="Invalid input. Please enter a number (1, 2, or 3).")
+        while self.game is None:
+            multipliers = await self.ask_multipliers()
+            try:
+                self.game = Engine(num_bots=num_bots, suits=list(multipliers) or None,
+                                   multipliers=multipliers or None, game_mode=game_mode, log=self.log)
+            except ValueError as e:
+                # The suits parsed, so the deck is too small for this many bots: ask for both again
+                await self.send(f"Invalid setup ({e}). Choose fewer bots or more suits.")
+                num_bots = await self.ask_num_bots()
+
+        await self.send("", f"Your card is: {self.game.card_table.name(self.game.player_card())}")
+
+    async def turn(self, bot_index):
+        """Show a bot's market and wait for the player's trade."""
+        game = self.game
+        quote = game.quote(bot_index)
+        await self.send(*market_lines(game, quote))
+
+        size = await self.ask_int("Enter your trade (positive to buy at ask, negative to sell at bid, 0 to skip): ",
+                                  valid=lambda size: abs(size) <= quote.volume,
+                                  error="Invalid trade volume. Try again.",
+                                  parse_error="Please enter a valid integer.")
+        await self.send(fill_line(game.trade(bot_index, size)))
+
+    async def position_check(self):
+        """Hard mode: ask the player to guess their current position."""
+        await self.send("", "--- Position Check ---")
+        guess = await self.ask("Guess your current position (e.g., 'long 3', 'short 2', or 'neutral'): ")
+        position = self.game.position
+        if self.game.record_guess(POSITION_CHECK, parse_position(guess), position):
+            await self.send("Correct! Your guess matches your actual position.")
+        else:
+            await self.send(f"Incorrect. Your actual position is {describe_position(position)}.")
+
+    async def settle(self):
+        """Settle the game, asking for the final guesses in Hard mode."""
+        game = self.game
+        settlement = game.settle()
+        if game.game_mode == HARD:
+            await self.send("", "--- Final Guess ---")
+            guess = await self.ask("What is your final position? (e.g., 'long 3', 'short 2', or 'neutral'): ")
+            guessed_pnl = await self.ask_int("What is your final PnL? ",
+                                             error="Invalid input. Please enter a number.")
+
+        await self.send(*final_check_lines(settlement))
+        if game.game_mode == HARD:
+            await self.send(*final_guess_lines(game, settlement, guess, guessed_pnl))
+
+    async def run(self):
+        """Play one full session, following the same rounds as `Game.start`."""
+        await self.setup()
+        game = self.game
+        await self.send(*rules_lines(game))
+        for round_index in range(game.num_flops + 1):
+            final_round = round_index == game.num_flops
+            if not final_round:
+                await self.send("", f"--- Round {round_index + 1}/{game.num_flops} ---")
+            else:
+                await self.send("", "--- Final Trading Round (All Community Cards Revealed) ---")
+
+            for bot_index in range(game.num_bots):
+                await self.send("", f"Bot {bot_index + 1}'s turn (Final Round):" if final_round
+                                else f"Bot {bot_index + 1}'s turn:")
+                await self.turn(bot_index)
+
+            if not final_round:
+                # Randomly check the player's position in some rounds
+                if game.game_mode == HARD and game.rng.random() < 0.5:
+                    await self.position_check()
+                game.flop()
+                await self.send(f"Community cards: {game.card_table.names(game.flops)}")
+
+        await self.settle()
+
+
+class SessionHost:
+    """Accept connections and run one `PlayerSession` per connection on a single event loop."""
+
+    def __init__(self, log=None, idle_timeout=None):
+        """
+        Parameters:
+            log (GameLog): Binary log shared by all sessions (optional).
+            idle_timeout (float): Seconds a session may wait for its player before it is closed.
+        """
+        self.log = log
+        self.idle_timeout = idle_timeout
+        self.active_sessions = 0
+        self.completed_sessions = 0
+
+    async def handle(self, reader, writer):
+        """Run a session for a new connection."""
+        self.active_sessions += 1
+        session = PlayerSession(reader, writer, self.log, self.idle_timeout)
+        try:
+            await session.run()
+            self.completed_sessions += 1
+        except (ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765, backlog=1024):
+        """
+        Listen for players until cancelled.
+
+        Parameters:
+            host (str): Address to listen on.
+            port (int): Port to listen on.
+            backlog (int): Pending connections queued by the OS, large enough for a whole cohort joining at once.
+        """
+        server = await asyncio.start_server(self.handle, host, port, backlog=backlog)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host many concurrent game sessions over TCP.")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765, help="port to listen on (default: 8765)")
+    parser.add_argument('--idle-timeout', type=float, help="close sessions idle for this many seconds")
+    parser.add_argument('--log', help="append a binary record of every session to this file")
+    args = parser.parse_args(argv)
+
+    if args.log:
+        from gamelog import GameLog
+
+        with GameLog(args.log) as log:
+            asyncio.run(SessionHost(log, args.idle_timeout).serve(args.host, args.port))
+    else:
+        asyncio.run(SessionHost(idle_timeout=args.idle_timeout).serve(args.host, args.port))
+
+
+if __name__ == "__main__":
+    main()
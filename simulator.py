@@ -0,0 +1,160 @@
+from collections import namedtuple
+
+import numpy as np
+
+from deck import NUM_RANKS, CardTable
+from engine import DEFAULT_MULTIPLIERS, DEFAULT_SUITS
+
+# Per-game outcome arrays of shape (games,)
+SimulationResult = namedtuple('SimulationResult', ['position', 'pnl', 'final_table_value', 'profit'])
+
+
+def ev_taker(bids, asks, volume, expected_value):
+    """
+    Vectorized taker that trades the full volume whenever a quote is through its expected value.
+
+    Parameters:
+        bids (np.ndarray): Bot bids, shape (games, bots).
+        asks (np.ndarray): Bot asks, shape (games, bots).
+        volume (int): Maximum trade size this round.
+        expected_value (np.ndarray): The player's expected final table value, shape (games, 1).
+
+    Returns:
+        np.ndarray: Trade sizes, shape (games, bots). Positive buys at the ask, negative sells at the bid.
+    """
+    return np.where(asks < expected_value, volume, np.where(bids > expected_value, -volume, 0))
+
+
+def bot_quotes(rng, card_values, community_value, expected_value_per_card, num_unknown_cards):
+    """
+    Vectorized version of `bots.ClassicBots` for every bot in every game.
+
+    Parameters:
+        rng (np.random.Generator): Random number generator for spreads and asymmetries.
+        card_values (np.ndarray): Value of each bot's private card, shape (games, bots).
+        community_value (np.ndarray): Revealed community value, shape (games, 1).
+        expected_value_per_card (np.ndarray): Mean value of the remaining deck, shape (games, 1).
+        num_unknown_cards (int): Remaining community cards + other players' private cards.
+
+    Returns:
+        tuple: (bids, asks), each of shape (games, bots).
+    """
+    mid_point = card_values + community_value + expected_value_per_card * num_unknown_cards
+    spread = rng.integers(10, 20, size=card_values.shape, endpoint=True)
+    asymmetry = rng.integers(-5, 5, size=card_values.shape, endpoint=True)
+    # int() in the engine truncates towards zero
+    bids = np.trunc(mid_point + asymmetry - spread).astype(np.int64)
+    asks = np.trunc(mid_point + asymmetry + spread).astype(np.int64)
+    return bids, asks
+
+
+def deal(rng, num_games, deck_size, num_cards):
+    """
+    Deal the first `num_cards` cards of a shuffled deck for every game.
+
+    Small decks are shuffled whole. When only a few cards are needed from a large deck, cards
+    are drawn with replacement and the games that drew a card twice are redrawn, so the cost
+    does not depend on the deck size.
+
+    Returns:
+        np.ndarray: Integer cards, shape (games, num_cards), distinct within each game.
+    """
+    if deck_size < 4 * num_cards * num_cards:
+        return rng.permuted(np.tile(np.arange(deck_size), (num_games, 1)), axis=1)[:, :num_cards]
+
+    cards = rng.integers(deck_size, size=(num_games, num_cards))
+    redraw = np.arange(num_games)
+    while len(redraw):
+        ordered = np.sort(cards[redraw], axis=1)
+        redraw = redraw[(ordered[:, 1:] == ordered[:, :-1]).any(axis=1)]
+        cards[redraw] = rng.integers(deck_size, size=(len(redraw), num_cards))
+    return cards
+
+
+def simulate(num_games, num_bots=4, suits=None, multipliers=None, num_flops=4, taker=ev_taker, seed=None,
+             batch_size=100_000, num_ranks=NUM_RANKS, first_rank=1, num_decks=1):
+    """
+    Play many games at once with NumPy arrays of shape (games, players) and (games, flops).
+
+    The rules follow `Engine`: each player is dealt one card from a shuffled deck, bots quote a
+    spread of 10-20 leaned by an asymmetry of -5 to 5 around the expected final table, the volume
+    is 2 ** (revealed flops), and every bot is traded once per round before the next flop plus
+    once more after the last flop. Since the deck is uniformly shuffled, the player always
+    holds the first dealt card without loss of generality.
+
+    Parameters:
+        num_games (int): Number of games to simulate.
+        num_bots (int): Number of bots in each game.
+        suits (list): Suit names to include (default: C, H and S).
+        multipliers (dict): Multiplier for each suit.
+        num_flops (int): Number of community cards to reveal.
+        taker (callable): Vectorized strategy with the signature of `ev_taker`.
+        seed: Seed for `np.random.default_rng`.
+        batch_size (int): Number of games held in memory at once.
+        num_ranks (int): Number of ranks in every suit.
+        first_rank (int): Lowest rank of every suit.
+        num_decks (int): Number of copies of the deck shuffled together.
+
+    Returns:
+        SimulationResult: Final position, PnL (as reported by `Engine.settle`), final table value
+        and profit (position * final table value - PnL) of every game.
+
+    Raises:
+        ValueError: If fewer than one game is asked for, or the deck is too small for the game.
+    """
+    if num_games < 1:
+        raise ValueError("You must simulate at least 1 game.")
+    suits = list(suits) if suits else list(DEFAULT_SUITS)
+    multipliers = DEFAULT_MULTIPLIERS if multipliers is None else multipliers
+    card_table = CardTable(suits, multipliers, num_ranks, first_rank, num_decks)
+    num_players = num_bots + 1
+    if num_players + num_flops > len(card_table):
+        raise ValueError("Not enough cards in the deck for every player and community card.")
+
+    rng = np.random.default_rng(seed)
+    results = [_simulate_batch(rng, min(batch_size, num_games - start), card_table, num_players, num_flops, taker)
+               for start in range(0, num_games, batch_size)]
+    return SimulationResult(*(np.concatenate(column) for column in zip(*results)))
+
+
+def _simulate_batch(rng, num_games, card_table, num_players, num_flops, taker):
+    """Simulate one batch of games. See `simulate`."""
+    deck_size = len(card_table)
+    values = card_table.value_array
+
+    # Deal: the first cards of each shuffled deck go to the players, the next ones are the flops
+    decks = deal(rng, num_games, deck_size, num_players + num_flops)
+    card_values = values[decks[:, :num_players]]  # (games, players), the player is column 0
+    flop_values = values[decks[:, num_players:num_players + num_flops]]  # (games, flops)
+
+    player_value = card_values[:, :1]
+    bot_values = card_values[:, 1:]
+    remaining_value = values.sum() - card_values.sum(axis=1, keepdims=True)
+    community_value = np.zeros((num_games, 1), dtype=np.int64)
+
+    position = np.zeros(num_games, dtype=np.int64)
+    pnl = np.zeros(num_games, dtype=np.int64)
+
+    for round_index in range(num_flops + 1):
+        num_remaining_cards = deck_size - num_players - round_index
+        expected_value_per_card = remaining_value / num_remaining_cards if num_remaining_cards > 0 else 0
+        num_unknown_cards = num_flops - round_index + (num_players - 1)
+        volume = 2 ** round_index
+
+        bids, asks = bot_quotes(rng, bot_values, community_value, expected_value_per_card, num_unknown_cards)
+
+        # The player's own expected value of the final table
+        expected_value = player_value + community_value + expected_value_per_card * num_unknown_cards
+        sizes = np.clip(taker(bids, asks, volume, expected_value), -volume, volume)
+        prices = np.where(sizes > 0, asks, bids)
+        position += sizes.sum(axis=1)
+        pnl += (sizes * prices).sum(axis=1)
+
+        # Reveal the next community card
+        if round_index < num_flops:
+            revealed = flop_values[:, round_index:round_index + 1]
+            community_value = community_value + revealed
+            remaining_value = remaining_value - revealed
+
+    final_table_value = card_values.sum(axis=1) + flop_values.sum(axis=1)
+    return position, pnl, final_table_value, position * final_table_value - pnl
@@ -0,0 +1,134 @@
+from collections import namedtuple
+
+# What an automated taker knows when it is shown a quote
+TakerInfo = namedtuple('TakerInfo', ['card', 'card_value', 'flops', 'bot_card_estimates', 'expected_value',
+                                     'variance'])
+
+
+def taker_info(game):
+    """
+    Collect the player's information from a game for an automated taker.
+
+    Parameters:
+        game (Engine): The game being played.
+
+    Returns:
+        TakerInfo: The player's card and its value, the revealed community cards, the inferred
+        bot card values, the expected final table (using inferred bot values) and the variance
+        of the remaining community cards.
+    """
+    num_remaining_community_cards = game.num_flops - len(game.flops)
+    return TakerInfo(
+        card=game.player_card(),
+        card_value=game.card_value(game.player_card()),
+        flops=list(game.flops),
+        bot_card_estimates=list(game.bot_card_estimates),
+        expected_value=game.calculate_expected_final_table_with_inferred_bots(),
+        variance=game.deck_state.variance_of_draws(num_remaining_community_cards),
+    )
+
+
+class Strategy:
+    """Base class for automated market takers."""
+
+    name = 'strategy'
+
+    def trade_size(self, quote, info):
+        """
+        Decide how much to trade against a quote.
+
+        Parameters:
+            quote (Quote): The bot's quote. `quote.volume` is the maximum trade size.
+            info (TakerInfo): The taker's own information.
+
+        Returns:
+            int: Positive to buy at the ask, negative to sell at the bid, 0 to skip.
+        """
+        raise NotImplementedError
+
+
+class AlwaysSkip(Strategy):
+    """Never trade."""
+
+    name = 'always-skip'
+
+    def trade_size(self, quote, info):
+        return 0
+
+
+class EVThreshold(Strategy):
+    """Trade the full volume whenever a quote is through the expected value by more than a threshold."""
+
+    name = 'ev-threshold'
+
+    def __init__(self, threshold=0):
+        """
+        Parameters:
+            threshold (float): Minimum edge over the expected value required to trade.
+        """
+        self.threshold = threshold
+
+    def trade_size(self, quote, info):
+        if info.expected_value - quote.ask > self.threshold:
+            return quote.volume
+        if quote.bid - info.expected_value > self.threshold:
+            return -quote.volume
+        return 0
+
+
+class Kelly(Strategy):
+    """
+    Size trades with the Kelly criterion.
+
+    For a position of q lots with edge e per lot and final table variance v, the growth-optimal
+    size for a bankroll W is approximately q = W * e / v, capped at the quoted volume.
+    """
+
+    name = 'kelly'
+
+    def __init__(self, bankroll=1000, fraction=1.0):
+        """
+        Parameters:
+            bankroll (float): Capital the taker is willing to risk.
+            fraction (float): Fraction of the full Kelly size to trade (e.g., 0.5 for half Kelly).
+        """
+        self.bankroll = bankroll
+        self.fraction = fraction
+
+    def trade_size(self, quote, info):
+        buy_edge = info.expected_value - quote.ask
+        sell_edge = quote.bid - info.expected_value
+        edge = max(buy_edge, sell_edge)
+        if edge <= 0:
+            return 0
+
+        # With no uncertainty left any positive edge is a sure thing
+        if info.variance <= 0:
+            size = quote.volume
+        else:
+            size = min(int(self.fraction * self.bankroll * edge / info.variance), quote.volume)
+        return size if buy_edge > sell_edge else -size
+
+
+class Scripted(Strategy):
+    """Replay pre-recorded trades instead of deciding them."""
+
+    name = 'scripted'
+
+    def __init__(self, trades):
+        """
+        Parameters:
+            trades (list): `trades[r][b]` is the size traded with bot b in round r (round r is
+                played with r community cards revealed). Missing rounds and bots are skipped.
+        """
+        self.trades = trades
+
+    def trade_size(self, quote, info):
+        round_index = len(info.flops)
+        if round_index >= len(self.trades) or quote.bot_index >= len(self.trades[round_index]):
+            return 0
+        return self.trades[round_index][quote.bot_index]
+
+
+# Built-in strategies by name
+STRATEGIES = {strategy.name: strategy for strategy in (AlwaysSkip, EVThreshold, Kelly, Scripted)}
@@ -0,0 +1,54 @@
+import string
+from collections import Counter
+from itertools import combinations
+from math import comb
+
+import numpy as np
+import pytest
+
+from deck import card_table
+from distribution import final_table_moments, unknown_sum_distribution
+
+MULTIPLIERS = {'c': 10, 'h': -10, 's': 10}
+
+
+def brute_force_distribution(table, known_cards, num_unknown_cards):
+    """Enumerate every hand of unknown cards from the rest of the deck."""
+    remaining = [card for card in range(len(table)) if card not in known_cards]
+    sums = Counter(sum(table.values[card] for card in hand) for hand in combinations(remaining, num_unknown_cards))
+    total = comb(len(remaining), num_unknown_cards)
+    return {value: count / total for value, count in sums.items()}
+
+
+@pytest.mark.parametrize('suits, num_ranks, num_decks, known_cards, num_unknown_cards', [
+    (['c', 'h', 's'], 4, 1, [0, 5], 3),
+    (['c', 'h'], 5, 2, [1], 4),
+    (['c', 'h', 's'], 3, 1, [], 9),
+    (['c', 'h', 's'], 3, 1, [2, 4], 0),
+])
+def test_unknown_sum_distribution_matches_enumeration(suits, num_ranks, num_decks, known_cards, num_unknown_cards):
+    table = card_table(suits, MULTIPLIERS, num_ranks, 1, num_decks)
+    known_values = [table.values[card] for card in known_cards]
+    sums, probabilities = unknown_sum_distribution(table, known_values, num_unknown_cards)
+
+    expected = brute_force_distribution(table, known_cards, num_unknown_cards)
+    assert sorted(expected) == sums.tolist()
+    np.testing.assert_allclose(probabilities, [expected[value] for value in sums.tolist()], rtol=1e-12)
+
+
+def test_unknown_sum_distribution_does_not_overflow_on_large_decks():
+    # 52 suits x 100 copies with 100 bots and 8 flops: C(67,598, 108) is far beyond the range of a float64
+    suits = list(string.ascii_letters)
+    multipliers = {suit: 10 if i % 2 == 0 else -10 for i, suit in enumerate(suits)}
+    table = card_table(suits, multipliers, 13, 1, 100)
+    known_cards = [0, 1]
+    num_unknown_cards = 108
+
+    with np.errstate(over='raise', invalid='raise'):
+        sums, probabilities = unknown_sum_distribution(table, [table.values[card] for card in known_cards],
+                                                       num_unknown_cards)
+    mean, variance = final_table_moments(table, known_cards, num_unknown_cards)
+    known_value = sum(table.values[card] for card in known_cards)
+    assert probabilities.sum() == pytest.approx(1)
+    assert known_value + sums @ probabilities == pytest.approx(mean)
+    assert ((known_value + sums - mean) ** 2) @ probabilities == pytest.approx(variance)
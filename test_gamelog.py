@@ -0,0 +1,39 @@
+from engine import Engine
+from gamelog import FLOP, GameLog, GameReplay
+from runner import play_game
+from strategies import EVThreshold, taker_info
+
+CONFIG = {'num_bots': 3, 'num_flops': 4, 'suits': ['stars', 'c'], 'multipliers': {'stars': 3, 'c': -10},
+          'num_ranks': 6, 'num_decks': 2}
+SEED = 12
+
+
+def test_replay_matches_the_logged_game(tmp_path):
+    path = tmp_path / 'games.log'
+    with GameLog(path) as log:
+        settlement = play_game(EVThreshold(), SEED, log=log, **CONFIG)
+
+    # Play the same seeded game again without a log, stopping after the second flop
+    game = Engine(seed=SEED, **CONFIG)
+    strategy = EVThreshold()
+    for round_index in range(2):
+        for bot_index in range(game.num_bots):
+            quote = game.quote(bot_index)
+            game.trade(bot_index, strategy.trade_size(quote, taker_info(game)))
+        game.flop()
+
+    replay = GameReplay(path)
+    records = replay.session_records(0)
+    second_flop = int(records['step'][records['kind'] == FLOP][1])
+    state = replay.state(0, second_flop)
+    assert state.suits == ['stars', 'c']
+    assert state.num_decks == 2
+    assert state.cards == game.cards
+    assert state.player_position == game.player_position
+    assert state.flops == list(game.flops)
+    assert (state.position, state.pnl) == (game.position, game.pnl)
+
+    final = replay.state(0)
+    assert final.settlement == settlement
+    assert final.flops[:2] == list(game.flops)
+    assert (final.position, final.pnl) == (settlement.position, settlement.pnl)
@@ -0,0 +1,15 @@
+import pytest
+
+from bots import AdaptiveBots, ClassicBots
+from runner import run_sessions
+from strategies import EVThreshold
+
+
+@pytest.mark.parametrize('bot_model', [ClassicBots, AdaptiveBots])
+def test_run_sessions_does_not_depend_on_the_number_of_workers(bot_model):
+    # Uneven chunks, so sessions land on different workers than in a single process
+    serial = run_sessions(EVThreshold(), 30, seed=7, workers=1, num_bots=3, bot_model=bot_model)
+    parallel = run_sessions(EVThreshold(), 30, seed=7, workers=4, chunk_size=4, num_bots=3, bot_model=bot_model)
+
+    assert parallel == serial
+    assert len(set(serial)) > 1  # Every session plays its own deal
@@ -0,0 +1,53 @@
+import math
+from collections import namedtuple
+
+from runner import run_sessions
+from strategies import AlwaysSkip, EVThreshold, Kelly
+
+# Summary of one strategy's results over a tournament
+TournamentResult = namedtuple('TournamentResult', ['name', 'games', 'mean', 'variance', 'sharpe'])
+
+
+def run_tournament(strategies, num_games=1000, seed=0, workers=1, **config):
+    """
+    Play the same seeded games with every strategy and summarize the profit of each.
+
+    Parameters:
+        strategies (list): The strategies to compare.
+        num_games (int): Number of games per strategy.
+        seed (int): Root seed. Game i is dealt identically for every strategy.
+        workers (int): Number of worker processes (None for all cores).
+        **config: Any other `Engine` arguments.
+
+    Returns:
+        list: One TournamentResult per strategy with the mean, variance and Sharpe ratio
+        (mean / standard deviation) of the per-game profit.
+    """
+    results = []
+    for strategy in strategies:
+        settlements = run_sessions(strategy, num_games, seed=seed, workers=workers, **config)
+        profits = [settlement.profit for settlement in settlements]
+        results.append(summarize(strategy.name, profits))
+    return results
+
+
+def summarize(name, profits):
+    """Summarize per-game profits as a TournamentResult."""
+    games = len(profits)
+    mean = sum(profits) / games if games else 0
+    variance = sum((p - mean) ** 2 for p in profits) / (games - 1) if games > 1 else 0
+    sharpe = mean / math.sqrt(variance) if variance > 0 else 0
+    return TournamentResult(name, games, mean, variance, sharpe)
+
+
+def format_report(results):
+    """Format tournament results as a table."""
+    lines = [f"{'Strategy':<16}{'Games':>8}{'Mean PnL':>12}{'Variance':>14}{'Sharpe':>10}"]
+    for result in results:
+        lines.append(f"{result.name:<16}{result.games:>8}{result.mean:>12.2f}{result.variance:>14.2f}"
+                     f"{result.sharpe:>10.3f}")
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    print(format_report(run_tournament([AlwaysSkip(), EVThreshold(), Kelly()], workers=None)))